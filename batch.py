@@ -0,0 +1,135 @@
+import argparse
+import cProfile
+import csv
+import json
+import os
+import time
+import tracemalloc
+from profiling import Profiler, Write_Folded
+from solutions import SolutionCache
+from solver import Solver
+from transposition import TranspositionTable
+
+def Run_Batch(levels_dir, algorithms, pruning = True, heuristic = 'matching', weight = 2.0, trace_memory = False,
+              table_size = 1 << 20, table_policy = 'always', workers = os.cpu_count(), goal = 'boxes',
+              cache_dir = '.level_cache', time_budget = None, node_budget = None, profile_phases = False,
+              cprofile_path = None, memory_budget = 64 << 20, external_dir = None, solution_cache_path = None,
+              solution_cache_size = 1000):
+    solution_cache = SolutionCache(solution_cache_path, solution_cache_size) if solution_cache_path else None
+    solver = Solver(levels_dir, pruning, heuristic, weight, table_size, table_policy, workers, goal, cache_dir,
+                    time_budget, node_budget, memory_budget=memory_budget, external_dir=external_dir,
+                    solution_cache=solution_cache)
+    levels = sorted(f for f in os.listdir(levels_dir) if f.endswith('.txt'))
+    profile = cProfile.Profile() if cprofile_path else None
+    results = list()
+    for level_name in levels:
+        for algorithm in algorithms:
+            if trace_memory:
+                tracemalloc.start()
+            profiler = Profiler(solver) if profile_phases else None
+            if profile is not None:
+                profile.enable()
+            start_time = time.perf_counter()
+            if profiler is not None:
+                with profiler:
+                    result = solver.Solve(level_name, algorithm)
+            else:
+                result = solver.Solve(level_name, algorithm)
+            elapsed = time.perf_counter() - start_time
+            if profile is not None:
+                profile.disable()
+            row = result.To_Dict()
+            if profiler is not None:
+                row['profile'] = profiler.Report()
+            if trace_memory:
+                row['peak_memory'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            row['level'] = os.path.splitext(level_name)[0]
+            row['time'] = elapsed
+            row['nodes_per_sec'] = result.stats['iteration_count'] / elapsed if elapsed > 0 else 0.0
+            results.append(row)
+            stopped = f" stopped={result.stop_reason}" if result.stop_reason else ''
+            if result.cached:
+                stopped += ' cached'
+            print(f"{row['level']:<16} {algorithm:<36} solved={row['solved']!s:<5} "
+                  f"steps={row['steps_counter']:<6} iterations={row['iteration_count']:<10} time={elapsed:.3f}s{stopped}")
+    if profile is not None:
+        profile.dump_stats(cprofile_path)
+    if solution_cache is not None:
+        solution_cache.Flush()
+    return results
+
+def Write_JSON(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+def Write_CSV(results, path):
+    if not results:
+        return
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Sokoban solver headless over every level in a directory.')
+    parser.add_argument('--levels-dir', default='Levels')
+    parser.add_argument('--algorithm', action='append', choices=Solver.algorithms,
+                        help='algorithm to run (repeatable, default: all)')
+    parser.add_argument('--no-pruning', action='store_true',
+                        help='disable dead-square and freeze deadlock pruning')
+    parser.add_argument('--heuristic', default='matching', choices=Solver.heuristics,
+                        help='heuristic for the informed searches')
+    parser.add_argument('--weight', type=float, default=2.0,
+                        help='heuristic weight for weighted A*')
+    parser.add_argument('--table-size', type=int, default=1 << 20,
+                        help='transposition table capacity for the IDA* and packed deepening searches')
+    parser.add_argument('--table-policy', default='always', choices=TranspositionTable.policies,
+                        help='transposition table replacement policy')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='worker processes for the parallel searches')
+    parser.add_argument('--goal', default='boxes', choices=Solver.goals,
+                        help="'boxes': all boxes on targets, 'state': match the file in 'Final states'")
+    parser.add_argument('--cache-dir', default='.level_cache',
+                        help='directory of the compiled level cache')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='do not read or write the on-disk level cache')
+    parser.add_argument('--memory-budget', type=int, default=64 << 20,
+                        help='bytes of RAM the external-memory search may use for buffering states')
+    parser.add_argument('--external-dir',
+                        help='directory for the external-memory search layer files (default: system temp)')
+    parser.add_argument('--solution-cache',
+                        help='reuse solutions stored in this file, including mirrored and rotated levels')
+    parser.add_argument('--solution-cache-size', type=int, default=1000,
+                        help='number of solutions the cache keeps before evicting the least recently used')
+    parser.add_argument('--time-budget', type=float,
+                        help='stop each search after this many seconds and report partial stats')
+    parser.add_argument('--node-budget', type=int,
+                        help='stop each search after this many expanded nodes and report partial stats')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='record peak traced memory of each run (slows the search down)')
+    parser.add_argument('--profile', help='time each search phase and write the per-run breakdown as JSON to this file')
+    parser.add_argument('--flamegraph', help='write the phase call stacks in folded format to this file')
+    parser.add_argument('--cprofile', help='run the searches under cProfile and save the stats to this file')
+    parser.add_argument('--json', help='write results as JSON to this file')
+    parser.add_argument('--csv', help='write results as CSV to this file')
+    args = parser.parse_args()
+
+    results = Run_Batch(args.levels_dir, args.algorithm or Solver.algorithms, not args.no_pruning,
+                        args.heuristic, args.weight, args.trace_memory, args.table_size, args.table_policy,
+                        args.workers, args.goal, None if args.no_cache else args.cache_dir,
+                        args.time_budget, args.node_budget, bool(args.profile or args.flamegraph), args.cprofile,
+                        args.memory_budget, args.external_dir, args.solution_cache, args.solution_cache_size)
+    profiles = [dict(level=row['level'], algorithm=row['algorithm'], **row.pop('profile'))
+                for row in results if 'profile' in row]
+    if args.profile:
+        Write_JSON(profiles, args.profile)
+    if args.flamegraph:
+        Write_Folded(profiles, args.flamegraph)
+    if args.json:
+        Write_JSON(results, args.json)
+    if args.csv:
+        Write_CSV(results, args.csv)
+
+if __name__ == '__main__':
+    main()
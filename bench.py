@@ -0,0 +1,168 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import corpus
+from batch import Write_JSON
+from solver import Solver
+
+compared_metrics = ['iteration_count', 'generated_count', 'max_node_count']
+timing_metrics = ['time', 'search_rss']
+machine_fields = ['time', 'nodes_per_sec', 'peak_rss', 'search_rss', 'peak_memory']
+
+def Run_Case(connection, levels_dir, level_name, algorithm, time_budget, workers, trace_memory):
+    solver = Solver(levels_dir, workers=workers, cache_dir=None, time_budget=time_budget)
+    idle_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    result = solver.Solve(level_name, algorithm)
+    elapsed = time.perf_counter() - start_time
+    row = result.To_Dict()
+    del row['moves']
+    row['level'] = os.path.splitext(level_name)[0]
+    row['time'] = elapsed
+    row['nodes_per_sec'] = result.stats['iteration_count'] / elapsed if elapsed > 0 else 0.0
+    if trace_memory:
+        row['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    row['peak_rss'] = max(self_usage.ru_maxrss, children_usage.ru_maxrss) * 1024
+    row['search_rss'] = max(0, row['peak_rss'] - idle_rss)
+    connection.send(row)
+    connection.close()
+
+def Collect_Cases(levels_dir, collections, work_dir):
+    cases = [(levels_dir, f) for f in sorted(os.listdir(levels_dir)) if f.endswith('.txt')]
+    for path in collections:
+        cases.extend((work_dir, name) for name in corpus.Export_Collection(path, work_dir))
+    return cases
+
+def Run_Process(context, levels_dir, level_name, algorithm, time_budget, workers, trace_memory):
+    parent_end, child_end = context.Pipe(duplex=False)
+    process = context.Process(target=Run_Case, args=(
+        child_end, levels_dir, level_name, algorithm, time_budget, workers, trace_memory))
+    process.start()
+    child_end.close()
+    try:
+        row = parent_end.recv()
+    except EOFError:
+        row = {'level': os.path.splitext(level_name)[0], 'algorithm': algorithm,
+               'solved': False, 'stopped': 'crashed'}
+    process.join()
+    return row
+
+def Run_Suite(cases, algorithms, time_budget = 30.0, workers = 2, trace_memory = False, repeat = 1):
+    context = multiprocessing.get_context('spawn')
+    results = list()
+    for levels_dir, level_name in cases:
+        for algorithm in algorithms:
+            rows = [Run_Process(context, levels_dir, level_name, algorithm, time_budget, workers, trace_memory)
+                    for _ in range(repeat)]
+            row = next((row for row in rows if row['stopped'] == 'crashed'), rows[0])
+            for field in machine_fields:
+                if all(field in other for other in rows):
+                    row[field] = statistics.median(other[field] for other in rows)
+            results.append(row)
+            print(f"{row['level']:<16} {algorithm:<36} solved={row['solved']!s:<5} "
+                  f"steps={row.get('steps_counter', 0):<6} iterations={row.get('iteration_count', 0):<10} "
+                  f"time={row.get('time', 0.0):.3f}s rss={row.get('peak_rss', 0) / (1 << 20):.1f}MiB"
+                  f"{' stopped=' + row['stopped'] if row['stopped'] else ''}")
+    return results
+
+def Baseline_Rows(results, timing = False):
+    if timing:
+        return results
+    return [{field: value for field, value in row.items() if field not in machine_fields} for row in results]
+
+def Compare(results, baseline, threshold = 0.25, timing = False, min_time = 0.5, min_rss = 1 << 20):
+    regressions = list()
+    old_rows = {(row['level'], row['algorithm']): row for row in baseline}
+    for row in results:
+        old = old_rows.get((row['level'], row['algorithm']))
+        if old is None or not old['solved']:
+            continue
+        name = f"{row['level']} / {row['algorithm']}"
+        if not row['solved']:
+            regressions.append(f"{name}: no longer solved ({row['stopped'] or 'no solution'})")
+            continue
+        if row['steps_counter'] > old['steps_counter']:
+            regressions.append(f"{name}: solution length {old['steps_counter']} -> {row['steps_counter']}")
+        for metric in compared_metrics + (timing_metrics if timing else []):
+            if metric not in old or metric not in row:
+                continue
+            if metric == 'time' and old[metric] < min_time:
+                continue
+            if metric == 'search_rss' and row[metric] - old[metric] < min_rss:
+                continue
+            if row[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {old[metric]:.6g} -> {row[metric]:.6g} "
+                                   f"(+{row[metric] / old[metric] - 1 if old[metric] else 0:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every algorithm over the level corpus '
+                                                 'and check the results against a stored baseline. '
+                                                 'By default only machine-independent counts are compared: '
+                                                 'iterations, generated and stored nodes, and solution length. '
+                                                 'Wall time and memory are compared only with --timing, '
+                                                 'against a baseline recorded on the same machine.')
+    parser.add_argument('--levels-dir', default='Levels')
+    parser.add_argument('--corpus-dir', default=os.path.join('Levels', 'Collections'),
+                        help='directory of XSB/.sok collections added to the corpus')
+    parser.add_argument('--algorithm', action='append', choices=Solver.algorithms,
+                        help='algorithm to run (repeatable, default: all)')
+    parser.add_argument('--time-budget', type=float, default=30.0,
+                        help='seconds each search may run before it is stopped')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='worker processes for the parallel searches (their node counts depend on it)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also record peak traced memory (slows the search down)')
+    parser.add_argument('--output', default='bench_results.json', help='file to write the results to')
+    parser.add_argument('--baseline', default='bench_baseline.json', help='stored baseline to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='relative increase of a metric that counts as a regression')
+    parser.add_argument('--timing', action='store_true',
+                        help='also compare wall time and search memory, taken as the median of --repeat runs')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per case with --timing')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='ignore wall time regressions of runs faster than this in the baseline')
+    parser.add_argument('--min-rss', type=int, default=1 << 20,
+                        help='ignore search memory growth smaller than this many bytes')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='overwrite the baseline with these results; wall time and memory are kept '
+                             'only with --timing, for a baseline local to this machine')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        cases = Collect_Cases(args.levels_dir, corpus.Find_Collections(args.corpus_dir), work_dir)
+        results = Run_Suite(cases, args.algorithm or Solver.algorithms, args.time_budget, args.workers,
+                            args.trace_memory, args.repeat if args.timing else 1)
+    Write_JSON(results, args.output)
+
+    if args.update_baseline:
+        Write_JSON(Baseline_Rows(results, args.timing), args.baseline)
+        print(f'baseline written to {args.baseline}')
+        return
+    if not os.path.exists(args.baseline):
+        print(f'no baseline at {args.baseline}, run with --update-baseline to create one')
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = Compare(results, baseline, args.threshold, args.timing, args.min_time, args.min_rss)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        sys.exit(1)
+    print(f'no regressions against {args.baseline}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import os
+import time
+from queue import Queue, LifoQueue
+from frontier import Make_Frontier
+from solver import Solver
+
+directions = ['up', 'down', 'right', 'left']
+
+def Locking_Search(solver, start_state, final_state, structure_type):
+    O = LifoQueue() if structure_type == 'stack' else Queue()
+    O.put(start_state)
+    C = {start_state}
+    iteration_count = 0
+    max_node_count = 0
+    O_max_node_count = 0
+    while not O.empty():
+        iteration_count += 1
+        state = O.get()
+        if state == final_state:
+            break
+        for direction in directions:
+            new_state = solver.Check_Direction(direction, state)
+            if new_state != None and not new_state in C:
+                O.put(new_state)
+                C.add(new_state)
+                O_size = O.qsize()
+                max_node_count = max(max_node_count, len(C) + O_size)
+                O_max_node_count = max(O_max_node_count, O_size)
+    return iteration_count
+
+def Frontier_Search(solver, start_state, final_state, structure_type):
+    O = Make_Frontier(structure_type)
+    O.Put(start_state)
+    C = {start_state}
+    iteration_count = 0
+    while O:
+        iteration_count += 1
+        solver.Count_Nodes(len(C), len(O))
+        state = O.Get()
+        if state == final_state:
+            break
+        for direction in directions:
+            new_state = solver.Check_Direction(direction, state)
+            if new_state != None and not new_state in C:
+                O.Put(new_state)
+                C.add(new_state)
+    return iteration_count
+
+def Locking_Operations(count, structure_type):
+    O = LifoQueue() if structure_type == 'stack' else Queue()
+    O_max_node_count = 0
+    for i in range(count):
+        O.put(i)
+        O_max_node_count = max(O_max_node_count, O.qsize())
+    while not O.empty():
+        O.get()
+    return count
+
+def Frontier_Operations(count, structure_type):
+    O = Make_Frontier(structure_type)
+    for i in range(count):
+        O.Put(i)
+    while O:
+        O.Get()
+    return count
+
+def Best_Rate(function, repeats, *args):
+    best = 0.0
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        nodes = function(*args)
+        elapsed = time.perf_counter() - start_time
+        best = max(best, nodes / elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare queue.Queue/LifoQueue with the lock-free frontiers.')
+    parser.add_argument('--levels-dir', default='Levels')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--operations', type=int, default=200000,
+                        help='number of put/get pairs in the raw frontier benchmark')
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<28} {'frontier':<8} {'locking/s':>12} {'lock-free/s':>12} {'gain':>6}")
+    for structure_type in ['queue', 'stack']:
+        old = Best_Rate(Locking_Operations, args.repeats, args.operations, structure_type)
+        new = Best_Rate(Frontier_Operations, args.repeats, args.operations, structure_type)
+        print(f"{'put/get':<28} {structure_type:<8} {old:>12.0f} {new:>12.0f} {new / old:>5.2f}x")
+
+    solver = Solver(args.levels_dir, pruning=False)
+    levels = sorted(f for f in os.listdir(args.levels_dir) if f.endswith('.txt'))
+    for level_name in levels:
+        start_state, final_state = solver.Load_Level(level_name)
+        for structure_type in ['queue', 'stack']:
+            old = Best_Rate(Locking_Search, args.repeats, solver, start_state, final_state, structure_type)
+            new = Best_Rate(Frontier_Search, args.repeats, solver, start_state, final_state, structure_type)
+            name = os.path.splitext(level_name)[0]
+            print(f"{name:<28} {structure_type:<8} {old:>12.0f} {new:>12.0f} {new / old:>5.2f}x")
+
+if __name__ == '__main__':
+    main()
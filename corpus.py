@@ -0,0 +1,106 @@
+import argparse
+import os
+import re
+
+xsb_symbols = {
+    '#': '#',
+    '@': '@',
+    '+': '*',
+    '$': 'B',
+    '*': '+',
+    '.': 'X',
+    ' ': '.',
+    '-': '.',
+    '_': '.'
+}
+collection_extensions = ('.sok', '.xsb')
+
+def Expand_Run_Length(line):
+    return re.sub(r'(\d+)(.)', lambda match: match.group(2) * int(match.group(1)), line)
+
+def Is_Level_Line(line):
+    return '#' in line and all(symbol in xsb_symbols or symbol.isdigit() or symbol == '|' for symbol in line)
+
+def Parse_Collection(text):
+    levels = list()
+    rows = list()
+    comment = None
+    for line in text.splitlines() + ['']:
+        line = line.rstrip()
+        if Is_Level_Line(line):
+            rows.extend(Expand_Run_Length(line).split('|'))
+            continue
+        if rows:
+            levels.append([comment, rows])
+            rows = list()
+            comment = None
+        if line.startswith(';'):
+            comment = line[1:].strip() or comment
+        elif line.lower().startswith('title:') and levels:
+            levels[-1][0] = line[len('title:'):].strip()
+    return [(title or str(index + 1), Convert_Level(rows)) for index, (title, rows) in enumerate(levels)]
+
+def Convert_Level(rows):
+    cols = max(len(row) for row in rows)
+    rows = [row.ljust(cols) for row in rows]
+    players = [(x, y) for y, row in enumerate(rows) for x, symbol in enumerate(row) if symbol in '@+']
+    if len(players) != 1:
+        raise ValueError(f'Level must have exactly one player, found {len(players)}')
+    boxes = sum(row.count('$') + row.count('*') for row in rows)
+    targets = sum(row.count('.') + row.count('+') + row.count('*') for row in rows)
+    if boxes != targets:
+        raise ValueError(f'Level has {boxes} boxes and {targets} targets')
+
+    inside = {players[0]}
+    frontier = [players[0]]
+    while frontier:
+        x, y = frontier.pop()
+        for cell in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            cx, cy = cell
+            if not (0 <= cx < cols and 0 <= cy < len(rows)):
+                raise ValueError('Level is not enclosed by walls')
+            if cell not in inside and rows[cy][cx] != '#':
+                inside.add(cell)
+                frontier.append(cell)
+
+    lines = list()
+    for y, row in enumerate(rows):
+        line = ''.join(
+            ' ' if (x, y) not in inside and symbol in ' -_' else xsb_symbols[symbol]
+            for x, symbol in enumerate(row)
+        )
+        lines.append(line.rstrip())
+    return '\n'.join(lines)
+
+def Load_Collection(path):
+    with open(path, 'r', encoding='utf-8') as collection_file:
+        return Parse_Collection(collection_file.read())
+
+def Export_Collection(path, levels_dir):
+    os.makedirs(levels_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    names = list()
+    for index, (title, level_text) in enumerate(Load_Collection(path)):
+        name = f'{stem} №{index + 1}.txt'
+        with open(os.path.join(levels_dir, name), 'w', encoding='utf-8') as level_file:
+            level_file.write(level_text)
+        names.append(name)
+    return names
+
+def Find_Collections(corpus_dir):
+    if not os.path.isdir(corpus_dir):
+        return list()
+    return sorted(os.path.join(corpus_dir, f) for f in os.listdir(corpus_dir) if f.endswith(collection_extensions))
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert XSB/.sok level collections into solver level files.')
+    parser.add_argument('collections', nargs='+', help='.sok or .xsb collection files')
+    parser.add_argument('--output', default='Levels', help='directory to write the converted levels to')
+    args = parser.parse_args()
+
+    for path in args.collections:
+        for name in Export_Collection(path, args.output):
+            print(os.path.join(args.output, name))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import heapq
+import os
+import sys
+import tempfile
+import solver
+from packed import PackedState
+from parallel import RecordCodec
+
+read_size = 1 << 16
+
+def Read_Records(path, record_size):
+    chunk_size = max(1, read_size // record_size) * record_size
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk), record_size):
+                yield chunk[offset:offset + record_size]
+
+def Write_Records(path, records):
+    count = 0
+    with open(path, 'wb', buffering=read_size) as f:
+        for record in records:
+            f.write(record)
+            count += 1
+    return count
+
+def Unique(records):
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+def Subtract(records, visited):
+    visited_record = next(visited, None)
+    for record in records:
+        while visited_record is not None and visited_record < record:
+            visited_record = next(visited, None)
+        if record != visited_record:
+            yield record
+
+class LayerStore:
+    def __init__(self, directory, record_size, buffer_capacity):
+        self.directory = directory
+        self.record_size = record_size
+        self.buffer_capacity = buffer_capacity
+        self.layers = list()
+        self.visited_path = os.path.join(directory, 'visited.bin')
+        self.visited_count = 0
+        Write_Records(self.visited_path, [])
+        self.runs = list()
+        self.buffer = set()
+
+    def Add(self, record):
+        self.buffer.add(record)
+        if len(self.buffer) >= self.buffer_capacity:
+            self.Flush()
+
+    def Flush(self):
+        if not self.buffer:
+            return
+        path = os.path.join(self.directory, f'run_{len(self.layers)}_{len(self.runs)}.bin')
+        Write_Records(path, sorted(self.buffer))
+        self.runs.append(path)
+        self.buffer = set()
+
+    def Close_Layer(self):
+        self.Flush()
+        candidates = Unique(heapq.merge(*(Read_Records(run, self.record_size) for run in self.runs)))
+        fresh = Subtract(candidates, Read_Records(self.visited_path, self.record_size))
+        path = os.path.join(self.directory, f'layer_{len(self.layers)}.bin')
+        count = Write_Records(path, fresh)
+        for run in self.runs:
+            os.remove(run)
+        self.runs = list()
+        self.layers.append((path, count))
+
+        merged = heapq.merge(Read_Records(self.visited_path, self.record_size), Read_Records(path, self.record_size))
+        self.visited_count = Write_Records(self.visited_path + '.tmp', merged)
+        os.replace(self.visited_path + '.tmp', self.visited_path)
+        return path, count
+
+def External_Search(owner, level_name, memory_budget, directory = None):
+    start_state, final_state = owner.Load_Level(level_name)
+    level = owner.Pack_Level()
+    codec = RecordCodec(level)
+    start_state = level.Pack(start_state)
+    final_state = level.Pack(final_state)
+    record_size = codec.size
+    record_memory = sys.getsizeof(bytes(record_size)) + 40
+    buffer_capacity = max(1024, memory_budget // record_memory)
+
+    with tempfile.TemporaryDirectory(dir=directory) as work_dir:
+        store = LayerStore(work_dir, record_size, buffer_capacity)
+        store.Add(codec.Encode(start_state.player, start_state.boxes))
+        layer_path, layer_count = store.Close_Layer()
+        found = None
+
+        while layer_count and found is None:
+            owner.search_depth = len(store.layers) - 1
+            remaining = layer_count
+            for record in Read_Records(layer_path, record_size):
+                owner.iteration_count += 1
+                owner.Count_Nodes(store.visited_count, remaining)
+                remaining -= 1
+                player, boxes = codec.Decode(record)
+                state = PackedState(player, boxes, 0)
+                if owner.Is_Goal(state, final_state):
+                    found = record
+                    owner.O_end_node_count = remaining
+                    break
+                for new_state in owner.Packed_Successors(level, state):
+                    store.Add(codec.Encode(new_state.player, new_state.boxes))
+            if found is None:
+                layer_path, layer_count = store.Close_Layer()
+
+        if found is None:
+            return None
+
+        counters = owner.generated_count, owner.dead_square_pruned, owner.freeze_pruned
+        path = [found]
+        depth = len(store.layers) - 1
+        while depth > 0:
+            depth -= 1
+            target = path[-1]
+            for record in Read_Records(store.layers[depth][0], record_size):
+                player, boxes = codec.Decode(record)
+                successors = owner.Packed_Successors(level, PackedState(player, boxes, 0))
+                if any(codec.Encode(new_state.player, new_state.boxes) == target for new_state in successors):
+                    path.append(record)
+                    break
+        path.reverse()
+        owner.generated_count, owner.dead_square_pruned, owner.freeze_pruned = counters
+        owner.steps_counter += len(path) - 1
+        return [solver.State(*level.Unpack(PackedState(*codec.Decode(record), 0))) for record in path]
@@ -0,0 +1,78 @@
+import heapq
+from collections import deque
+
+class QueueFrontier:
+    def __init__(self):
+        self.items = deque()
+
+    def __len__(self):
+        return len(self.items)
+
+    def Put(self, item, priority = 0):
+        self.items.append(item)
+
+    def Get(self):
+        return self.items.popleft()
+
+class StackFrontier:
+    def __init__(self):
+        self.items = list()
+
+    def __len__(self):
+        return len(self.items)
+
+    def Put(self, item, priority = 0):
+        self.items.append(item)
+
+    def Get(self):
+        return self.items.pop()
+
+class HeapFrontier:
+    def __init__(self):
+        self.items = list()
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def Put(self, item, priority = 0):
+        self.counter += 1
+        heapq.heappush(self.items, (priority, self.counter, item))
+
+    def Get(self):
+        return heapq.heappop(self.items)[2]
+
+class BucketFrontier:
+    def __init__(self):
+        self.buckets = list()
+        self.current = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def Put(self, item, priority = 0):
+        while len(self.buckets) <= priority:
+            self.buckets.append(list())
+        self.buckets[priority].append(item)
+        self.size += 1
+        if priority < self.current:
+            self.current = priority
+
+    def Get(self):
+        while not self.buckets[self.current]:
+            self.current += 1
+        self.size -= 1
+        return self.buckets[self.current].pop()
+
+frontiers = {
+    'queue': QueueFrontier,
+    'stack': StackFrontier,
+    'heap': HeapFrontier,
+    'bucket': BucketFrontier
+}
+
+def Make_Frontier(structure_type):
+    if structure_type not in frontiers:
+        raise ValueError(f'Unknown frontier type: {structure_type}')
+    return frontiers[structure_type]()
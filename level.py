@@ -0,0 +1,175 @@
+import hashlib
+import os
+import pickle
+from collections import deque
+
+class CompiledLevel:
+    version = 3
+    directions = ['up', 'down', 'right', 'left']
+    delta = {
+        'up':    (0, -1),
+        'down':  (0,  1),
+        'left':  (-1, 0),
+        'right': (1,  0)
+    }
+
+    def __init__(self, level_text, final_text = None):
+        lines = level_text.split(sep='\n')
+        while lines and not lines[-1].strip():
+            lines.pop()
+        self.rows = len(lines)
+        self.cols = max(len(line) for line in lines)
+
+        self.player = None
+        boxes = list()
+        self.map = list()
+        for y, line in enumerate(lines):
+            row = list()
+            for x, symbol in enumerate(line.ljust(self.cols)):
+                if symbol == '@':
+                    self.player = (x, y)
+                    row.append('.')
+                elif symbol == '*':
+                    self.player = (x, y)
+                    row.append('X')
+                elif symbol == 'B':
+                    boxes.append((x, y))
+                    row.append('.')
+                elif symbol == '+':
+                    boxes.append((x, y))
+                    row.append('X')
+                else:
+                    row.append(symbol)
+            self.map.append(row)
+        self.boxes = frozenset(boxes)
+
+        self.walls = 0
+        self.cells = list()
+        self.index = dict()
+        for y in range(self.rows):
+            for x in range(self.cols):
+                if self.map[y][x] in ('#', ' '):
+                    self.walls |= 1 << (y * self.cols + x)
+                else:
+                    self.index[(x, y)] = len(self.cells)
+                    self.cells.append((x, y))
+
+        self.neighbors = [
+            [self.index.get((x + dx, y + dy), -1) for x, y in self.cells]
+            for dx, dy in (self.delta[direction] for direction in self.directions)
+        ]
+        self.targets = [cell for cell in self.cells if self.map[cell[1]][cell[0]] == 'X']
+        self.push_distances = {target: self.Pull_Distances(target) for target in self.targets}
+        self.dead_squares = frozenset(
+            cell for cell in self.cells
+            if not any(cell in distances for distances in self.push_distances.values())
+        )
+        self.goal_rooms = self.Goal_Rooms()
+
+        self.final_player = None
+        self.final_boxes = None
+        if final_text is not None:
+            final_boxes = list()
+            for y, line in enumerate(final_text.split(sep='\n')[:self.rows]):
+                for x, symbol in enumerate(line):
+                    if symbol == '@':
+                        self.final_player = (x, y)
+                    elif symbol == '+':
+                        final_boxes.append((x, y))
+            self.final_boxes = frozenset(final_boxes)
+
+    def Is_Floor(self, cell):
+        x, y = cell
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return False
+        return not (self.walls >> (y * self.cols + x)) & 1
+
+    def Pull_Distances(self, target):
+        distances = {target: 0}
+        frontier = deque([target])
+        while frontier:
+            bx, by = frontier.popleft()
+            for dx, dy in self.delta.values():
+                box = (bx + dx, by + dy)
+                player = (bx + 2 * dx, by + 2 * dy)
+                if box not in distances and self.Is_Floor(box) and self.Is_Floor(player):
+                    distances[box] = distances[(bx, by)] + 1
+                    frontier.append(box)
+        return distances
+
+    def Goal_Rooms(self):
+        rooms = dict()
+        for entrance in self.cells:
+            seen = {entrance}
+            order = list()
+            cells = {entrance}
+            for dx, dy in self.delta.values():
+                start = (entrance[0] + dx, entrance[1] + dy)
+                if start in seen or not self.Is_Floor(start):
+                    continue
+                distances = {entrance: 0, start: 1}
+                frontier = deque([start])
+                while frontier:
+                    x, y = frontier.popleft()
+                    for ndx, ndy in self.delta.values():
+                        cell = (x + ndx, y + ndy)
+                        if cell not in distances and self.Is_Floor(cell):
+                            distances[cell] = distances[(x, y)] + 1
+                            frontier.append(cell)
+                del distances[entrance]
+                seen.update(distances)
+                if self.player in distances or any(box in distances for box in self.boxes):
+                    continue
+                order += sorted((target for target in self.targets if target in distances),
+                                key=lambda target: -distances[target])
+                cells.update(distances)
+            if order:
+                rooms[entrance] = (order, frozenset(cells))
+        return {entrance: room for entrance, room in rooms.items()
+                if not any(other != entrance and entrance in rooms[other][1] for other in rooms)}
+
+class LevelCache:
+    def __init__(self, cache_dir = '.level_cache'):
+        self.cache_dir = cache_dir
+        self.levels = dict()
+
+    def Load(self, level_path, final_path = None):
+        with open(level_path, 'r', encoding='utf-8') as level_file:
+            level_text = level_file.read()
+        final_text = None
+        if final_path is not None:
+            with open(final_path, 'r', encoding='utf-8') as final_file:
+                final_text = final_file.read()
+
+        content = f'{CompiledLevel.version}\0{level_text}\0{final_text}'
+        key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if key in self.levels:
+            return self.levels[key]
+
+        level = self.Read(key)
+        if level is None:
+            level = CompiledLevel(level_text, final_text)
+            self.Write(key, level)
+        self.levels[key] = level
+        return level
+
+    def Read(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, key + '.pickle'), 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def Write(self, key, level):
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, key + '.pickle')
+            with open(path + '.tmp', 'wb') as cache_file:
+                pickle.dump(level, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
@@ -1,21 +1,9 @@
 import pygame
 import os
-from queue import Queue, LifoQueue
-
-class State:
-    def __init__(self, player_pos, boxes, prev_state = None, depth = 0):
-        self.player = player_pos
-        self.boxes = frozenset(boxes)
-        self.prev_state = prev_state
-        self.depth = depth
-
-    def __eq__(self, other):
-        if other is None:
-            return False
-        return self.player == other.player and self.boxes == other.boxes
-
-    def __hash__(self):
-        return hash((self.player, self.boxes))
+import threading
+import traceback
+from solutions import SolutionCache
+from solver import Solver
 
 class Game:
     def __init__(self):
@@ -26,10 +14,10 @@ class Game:
         self.height = 800
         self.surface = pygame.display.set_mode((self.width, self.height))
 
-        self.maps = list()
+        self.frames = None
+        self.board = dict()
         self.map_rows = 0
         self.map_cols = 0
-        self.map = list()
 
         self.block_size = 60
         self.font = pygame.font.SysFont("Arial", self.block_size)
@@ -40,7 +28,19 @@ class Game:
         self.selected_level = None
         self.level_index = 0
 
-        self.algorithms = ['depth-first search', 'iterative depth-first search', 'breadth-first search', 'bidirectional search']
+        self.solver = Solver(time_budget = 300, progress = self.Post_Progress, solution_cache = SolutionCache())
+        self.search_thread = None
+        self.progress_event = pygame.event.custom_type()
+        self.result_event = pygame.event.custom_type()
+        self.progress_stats = None
+        self.stop_reason = None
+        self.cached = False
+        self.stop_reasons = {
+            'cancelled': 'отменён пользователем',
+            'time budget': 'исчерпан лимит времени',
+            'node budget': 'исчерпан лимит узлов'
+        }
+        self.algorithms = self.solver.algorithms
         self.algorithm_index = 0
 
         self.iteration_count = 0
@@ -48,8 +48,13 @@ class Game:
         self.O_end_node_count = 0
         self.max_node_count = 0
         self.steps_counter = 0
+        self.dead_square_pruned = 0
+        self.freeze_pruned = 0
 
-        self.clock = pygame.time.Clock()
+        self.tiles = self.Build_Tiles(self.block_size)
+        self.frame_delay = 200
+        self.next_frame_time = 0
+        self.redraw = True
         pygame.display.flip()
 
     def __del__(self):
@@ -57,21 +62,30 @@ class Game:
     
     def Start(self):
         is_active = True
+        self.redraw = True
         while is_active:
-            for e in pygame.event.get():
+            for e in self.Wait_Events():
                 if e.type == pygame.QUIT:
                     is_active = False
+                elif e.type == self.progress_event:
+                    self.progress_stats = e.stats
+                    self.redraw = True
+                elif e.type == self.result_event:
+                    self.Finish_Search(e.result)
                 elif e.type == pygame.KEYDOWN:
+                    self.redraw = True
                     if e.key == pygame.K_UP and self.status == 'menu':
                         self.level_index = (self.level_index - 1) % len(self.levels)
                     elif e.key == pygame.K_DOWN and self.status == 'menu':
                         self.level_index = (self.level_index + 1) % len(self.levels)
                     elif e.key == pygame.K_SPACE and self.status == 'menu':
                         self.algorithm_index = (self.algorithm_index + 1) % len(self.algorithms) 
+                    elif e.key == pygame.K_ESCAPE and self.status == 'search':
+                        self.solver.Cancel()
                     elif e.key == pygame.K_RETURN:
                         if self.status == 'menu':
                             self.selected_level = self.levels[self.level_index] + '.txt'
-                            self.status = 'search'
+                            self.Start_Search()
                         elif self.status == 'stop':
                             self.status = 'stats'
                         elif self.status == 'stats' or self.status == 'error':
@@ -79,449 +93,164 @@ class Game:
             
             match self.status:
                 case 'menu':
-                    self.Draw_Menu()
+                    if self.redraw:
+                        self.Draw_Menu()
+                        pygame.display.flip()
+                        self.redraw = False
+
                 case 'search':
-                    self.iteration_count = 0
-                    self.O_max_node_count = 0
-                    self.O_end_node_count = 0
-                    self.max_node_count = 0
-                    self.steps_counter = 0
-                    match self.algorithms[self.algorithm_index]:
-                        case 'depth-first search':
-                            self.maps = self.Find_Solution(self.selected_level, 'stack')
-                        case 'iterative depth-first search':
-                            self.maps = self.DFS_Iterative(self.selected_level)
-                        case 'breadth-first search': 
-                            self.maps = self.Find_Solution(self.selected_level, 'queue')
-                        case 'bidirectional search':
-                            self.maps = self.Bidirectional_Search(self.selected_level)
-                    if self.maps == None:
-                        self.status = 'error'
-                    else:
-                        self.status = 'show'
+                    if self.redraw:
+                        self.Draw_Progress()
+                        pygame.display.flip()
+                        self.redraw = False
 
                 case 'show':
-                    map = self.maps.pop()
-                    self.Draw_Map(map)
-                    if len(self.maps) == 0:
-                        self.status = 'stop'
-                    pygame.time.delay(200)
+                    if pygame.time.get_ticks() >= self.next_frame_time:
+                        frame = next(self.frames, None)
+                        if frame is None:
+                            self.frames = None
+                            self.status = 'stop'
+                        else:
+                            self.board.update(frame)
+                            if not self.redraw:
+                                pygame.display.update(self.Draw_Frame(frame))
+                        self.next_frame_time += self.frame_delay
+                    if self.redraw and self.status == 'show':
+                        self.surface.fill((62, 180, 137))
+                        self.Draw_Frame(self.board.items())
+                        pygame.display.flip()
+                        self.redraw = False
 
                 case 'stop':
-                    pass
+                    self.redraw = False
 
                 case 'stats':
-                    self.Draw_Stats()
+                    if self.redraw:
+                        self.Draw_Stats()
+                        pygame.display.flip()
+                        self.redraw = False
 
                 case 'error':
-                    self.Draw_Error()
-
-            pygame.display.flip()
-            self.clock.tick(60)
-
-    def Find_Solution(self, level_name, structure_type):
-        map_file = open('Levels/' + level_name, 'r') 
-        start_map = map_file.read().split(sep='\n')
-        map_file.close()
-        self.map_rows = len(start_map)
-        self.map_cols = len(start_map[0])
-        for i in range(self.map_rows):
-            start_map[i] = list(start_map[i])
-
-        player = None
-        boxes = list()
-        self.map.clear()
-        for y in range(self.map_rows):
-            row = list()
-            for x in range(self.map_cols):
-                if start_map[y][x] == '@':
-                    player = (x, y)
-                    row.append('.')
-                elif start_map[y][x] == '*':
-                    player = (x, y)
-                    row.append('X')
-                elif start_map[y][x] == 'B':
-                    boxes.append((x, y))
-                    row.append('.')
-                elif start_map[y][x] == '+':
-                    boxes.append((x, y))
-                    row.append('X')
-                else:
-                    row.append(start_map[y][x])
-            self.map.append(row)
-        start_state = State(player, boxes)
-        
-        final_state_file = open('Levels/Final States/' + level_name, 'r')
-        final_map = final_state_file.read().split(sep='\n')
-        final_state_file.close()
-        final_player = None
-        final_boxes = list()
-        for y in range(self.map_rows):
-            for x in range(self.map_cols):
-                if final_map[y][x] == '@':
-                    final_player = (x, y)
-                elif final_map[y][x] == '+':
-                    final_boxes.append((x, y))
-        final_state = State(final_player, final_boxes)
-
-        match structure_type:
-            case 'stack':
-                O = LifoQueue()
-            case 'queue':
-                O = Queue()
-        O.put(start_state)
-        C = {start_state}
-        directions = ['up', 'down', 'right', 'left']
-
-        while not O.empty():
-            self.iteration_count += 1
-            state = O.get()
-            if state == final_state:
-                self.O_end_node_count = O.qsize()
-                maps = list()
-                while state.prev_state != None:
-                    self.steps_counter += 1
-                    map = self.Create_Map(state)
-                    maps.append(map)
-                    state = state.prev_state
-                map = self.Create_Map(state)
-                maps.append(map)
-                return maps
-
-            for direction in directions:
-                new_state = self.Check_Direction(direction, state)
-                if new_state != None:
-                    if not new_state in C:
-                        O.put(new_state)
-                        C.add(new_state)
-                        O_size = O.qsize()
-                        self.max_node_count = max(self.max_node_count, len(C) + O_size)
-                        self.O_max_node_count = max(self.O_max_node_count, O_size)
-                        
-        return None
-
-    def DFS_Iterative(self, level_name):
-        map_file = open('Levels/' + level_name, 'r') 
-        start_map = map_file.read().split(sep='\n')
-        map_file.close()
-        self.map_rows = len(start_map)
-        self.map_cols = len(start_map[0])
-        for i in range(self.map_rows):
-            start_map[i] = list(start_map[i])
-
-        player = None
-        boxes = list()
-        self.map.clear()
-        for y in range(self.map_rows):
-            row = list()
-            for x in range(self.map_cols):
-                if start_map[y][x] == '@':
-                    player = (x, y)
-                    row.append('.')
-                elif start_map[y][x] == '*':
-                    player = (x, y)
-                    row.append('X')
-                elif start_map[y][x] == 'B':
-                    boxes.append((x, y))
-                    row.append('.')
-                elif start_map[y][x] == '+':
-                    boxes.append((x, y))
-                    row.append('X')
-                else:
-                    row.append(start_map[y][x])
-            self.map.append(row)
-        start_state = State(player, boxes)
-        
-        final_state_file = open('Levels/Final States/' + level_name, 'r')
-        final_map = final_state_file.read().split(sep='\n')
-        final_state_file.close()
-        final_player = None
-        final_boxes = list()
-        for y in range(self.map_rows):
-            for x in range(self.map_cols):
-                if final_map[y][x] == '@':
-                    final_player = (x, y)
-                elif final_map[y][x] == '+':
-                    final_boxes.append((x, y))
-        final_state = State(final_player, final_boxes)
-
-        directions = ['up', 'down', 'right', 'left']
-        O = LifoQueue()
-        cur_depth = 1
-        max_depth = 10000
-        
-        while True: 
-            O.put(start_state)
-            C = {start_state: start_state.depth}
-            while not O.empty():
-                self.iteration_count += 1
-                state = O.get()
-                if state == final_state:
-                    self.O_end_node_count = O.qsize()
-                    maps = list()
-                    while state.prev_state != None:
-                        self.steps_counter += 1
-                        map = self.Create_Map(state)
-                        maps.append(map)
-                        state = state.prev_state
-                    map = self.Create_Map(state)
-                    maps.append(map)
-                    return maps    
-
-                if state.depth < cur_depth:
-                    for direction in directions:
-                        new_state = self.Check_Direction(direction, state)
-                        if new_state != None:
-                            new_state.depth = state.depth + 1
-                            if not new_state in C or new_state.depth < C[new_state]:
-                                O.put(new_state)
-                                C[new_state] = new_state.depth
-                                O_size = O.qsize()
-                                self.max_node_count = max(self.max_node_count, len(C) + O_size)
-                                self.O_max_node_count = max(self.O_max_node_count, O_size)   
-
-            cur_depth += 1 
-            if cur_depth >= max_depth:
-                break
-
-        return None
-
-    def Bidirectional_Search(self, level_name):
-        map_file = open('Levels/' + level_name, 'r') 
-        start_map = map_file.read().split(sep='\n')
-        map_file.close()
-        self.map_rows = len(start_map)
-        self.map_cols = len(start_map[0])
-        for i in range(self.map_rows):
-            start_map[i] = list(start_map[i])
-
-        player = None
-        boxes = list()
-        self.map.clear()
-        for y in range(self.map_rows):
-            row = list()
-            for x in range(self.map_cols):
-                if start_map[y][x] == '@':
-                    player = (x, y)
-                    row.append('.')
-                elif start_map[y][x] == '*':
-                    player = (x, y)
-                    row.append('X')
-                elif start_map[y][x] == 'B':
-                    boxes.append((x, y))
-                    row.append('.')
-                elif start_map[y][x] == '+':
-                    boxes.append((x, y))
-                    row.append('X')
-                else:
-                    row.append(start_map[y][x])
-            self.map.append(row)
-        start_state = State(player, boxes)
-
-        O_start = Queue()
-        O_start.put(start_state)
-        C_start = {start_state}
-        
-
-        final_state_file = open('Levels/Final States/' + level_name, 'r')
-        final_map = final_state_file.read().split(sep='\n')
-        final_state_file.close()
-        final_player = None
-        final_boxes = list()
-        for y in range(self.map_rows):
-            for x in range(self.map_cols):
-                if final_map[y][x] == '@':
-                    final_player = (x, y)
-                elif final_map[y][x] == '+':
-                    final_boxes.append((x, y))
-        final_state = State(final_player, final_boxes)
-
-        O_final = Queue()
-        O_final.put(final_state)
-        C_final = {final_state}
-
-        directions = ['up', 'down', 'right', 'left']
-
-        while not O_start.empty() or not O_final.empty():
-            self.iteration_count += 1
-            if not O_start.empty():
-                state = O_start.get()
-
-                if state in C_final:
-                    self.O_end_node_count = O_start.qsize() + O_final.qsize()
-                    C_final_list = list(C_final)
-                    second_state = C_final_list.pop(C_final_list.index(state))
-                    return self.Connect_Ways(state, second_state)
-
-                for direction in directions:
-                    new_state = self.Check_Direction(direction, state)
-                    if new_state != None:
-                        if not new_state in C_start:
-                            O_start.put(new_state)
-                            C_start.add(new_state)
-                            O_size = O_start.qsize() + O_final.qsize()
-                            self.max_node_count = max(self.max_node_count, len(C_start) + len(C_final) + O_size)
-                            self.O_max_node_count = max(self.O_max_node_count, O_size)
-            
-            if not O_final.empty():
-                state = O_final.get()
-
-                if state in C_start:
-                    self.O_end_node_count = O_start.qsize() + O_final.qsize()
-                    C_start_list = list(C_start)
-                    second_state = C_start_list.pop(C_start_list.index(state))
-                    return self.Connect_Ways(second_state, state)
-
-                for direction in directions:
-                    new_states = self.Check_Direction_Backwards(direction, state)
-                    for new_state in new_states:
-                        if not new_state in C_final:
-                            O_final.put(new_state)
-                            C_final.add(new_state)
-                            O_size = O_start.qsize() + O_final.qsize()
-                            self.max_node_count = max(self.max_node_count, len(C_start) + len(C_final) + O_size)
-                            self.O_max_node_count = max(self.O_max_node_count, O_size)
-        
-        return None
-
-    def Connect_Ways(self, state_start_end, state_final_end):
-        path = list()
-        state = state_final_end
-        while state is not None:
-            path.append(state)
-            state = state.prev_state
-        path.reverse()
-
-        state = state_start_end.prev_state
-        while state is not None:
-            path.append(state)
-            state = state.prev_state
-        
-        maps = list()
-        for state in path:
-            self.steps_counter += 1
-            maps.append(self.Create_Map(state))
-
-        self.steps_counter -= 1
-        return maps
-
-    def Check_Direction(self, direction, state):
-        delta = {
-            'up':    (0, -1),
-            'down':  (0,  1),
-            'left':  (-1, 0),
-            'right': (1,  0)
-        }
-        dx, dy = delta[direction]
-        x, y = state.player
-        nx, ny = x + dx, y + dy 
-
-        if not (0 <= nx < self.map_cols and 0 <= ny < self.map_rows):
-            return None
-
-        if self.map[ny][nx] == '#':
-            return None
-
-        boxes = set(state.boxes)
-        if (nx, ny) in boxes:
-            nnx, nny = nx + dx, ny + dy
-            if not (0 <= nnx < self.map_cols and 0 <= nny < self.map_rows):
-                return None
-            if self.map[nny][nnx] == '#' or (nnx, nny) in boxes:
-                return None
-            boxes.remove((nx, ny))
-            boxes.add((nnx, nny))
-
-        return State((nx, ny), boxes, state)
-
-    def Check_Direction_Backwards(self, direction, state):
-        dx, dy = {
-            'up':    (0, -1),
-            'down':  (0,  1),
-            'left':  (-1, 0),
-            'right': (1,  0)
-        }[direction]
-
-        x, y = state.player
-        bx, by = x + dx, y + dy 
-        px, py = x - dx, y - dy 
-        states = list()
-
-        if not (0 <= bx < self.map_cols and 0 <= by < self.map_rows):
-            return states
-        if not (0 <= px < self.map_cols and 0 <= py < self.map_rows):
-            return states
-
-        if self.map[py][px] == '#':
-            return states
-
-        boxes = set(state.boxes)
-        
-        if (px, py) in boxes:
-            return states
-
-        if (bx, by) in boxes:
-            states.append(State((px, py), boxes, state))
-            boxes.remove((bx, by))
-            boxes.add((x, y))
-            states.append(State((px, py), boxes, state))
-            return states
-
-        states.append(State((px, py), boxes, state))
-        return states
-
-    def Create_Map(self, state):
-        map = [list(row) for row in self.map]
-        x, y = state.player
-        if map[y][x] == '.':
-            map[y][x] = '@'
+                    if self.redraw:
+                        self.Draw_Error()
+                        pygame.display.flip()
+                        self.redraw = False
+
+        if self.search_thread is not None:
+            self.solver.Cancel()
+            self.search_thread.join()
+        self.solver.solution_cache.Flush()
+
+    def Start_Search(self):
+        self.progress_stats = None
+        self.stop_reason = None
+        self.status = 'search'
+        result = self.solver.Lookup_Solution(self.selected_level, self.algorithms[self.algorithm_index])
+        if result is not None:
+            self.Finish_Search(result)
+            return
+        self.solver.cancelled.clear()
+        self.search_thread = threading.Thread(
+            target=self.Search, args=(self.selected_level, self.algorithms[self.algorithm_index]), daemon=True)
+        self.search_thread.start()
+
+    def Search(self, level_name, algorithm):
+        try:
+            result = self.solver.Solve(level_name, algorithm)
+        except Exception:
+            traceback.print_exc()
+            result = None
+        pygame.event.post(pygame.event.Event(self.result_event, result=result))
+
+    def Post_Progress(self, stats):
+        pygame.event.post(pygame.event.Event(self.progress_event, stats=stats))
+
+    def Finish_Search(self, result):
+        if self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = None
+        if result is None:
+            self.status = 'error'
+            self.redraw = True
+            return
+        self.Set_Stats(result.stats)
+        self.stop_reason = result.stop_reason
+        self.cached = result.cached
+        self.map_rows = len(result.map)
+        self.map_cols = len(result.map[0]) if result.map else 0
+        if result.solved:
+            self.frames = result.Frames()
+            self.board = dict()
+            self.next_frame_time = pygame.time.get_ticks()
+            self.status = 'show'
+        elif result.stop_reason is not None:
+            self.status = 'stats'
         else:
-            map[y][x] = '*'
-
-        for box in state.boxes:
-            x, y = box
-            if map[y][x] == '.':
-                map[y][x] = 'B'
-            else:
-                map[y][x] = '+'
-
-        return map
-
-    def Draw_Map(self, map):
-        self.surface.fill((62, 180, 137))
+            self.status = 'error'
+        self.redraw = True
+
+    def Wait_Events(self):
+        if self.redraw:
+            return pygame.event.get()
+        if self.status == 'show':
+            timeout = self.next_frame_time - pygame.time.get_ticks()
+            if timeout <= 0:
+                return pygame.event.get()
+            return [pygame.event.wait(timeout)] + pygame.event.get()
+        return [pygame.event.wait()] + pygame.event.get()
+
+    def Set_Stats(self, stats):
+        self.iteration_count = stats['iteration_count']
+        self.O_max_node_count = stats['O_max_node_count']
+        self.O_end_node_count = stats['O_end_node_count']
+        self.max_node_count = stats['max_node_count']
+        self.steps_counter = stats['steps_counter']
+        self.dead_square_pruned = stats['dead_square_pruned']
+        self.freeze_pruned = stats['freeze_pruned']
+
+    def Build_Tiles(self, block_size):
+        tiles = dict()
+        for symbol in '#.@*BX+':
+            tile = pygame.Surface((block_size, block_size)).convert()
+            match symbol:
+                case '#':
+                    pygame.draw.rect(tile, (0, 0, 0), [0, 0, block_size, block_size])
+                case '.':
+                    pygame.draw.rect(tile, (255, 255, 255), [0, 0, block_size, block_size])
+                case '@':
+                    pygame.draw.rect(tile, (255, 255, 255), [0, 0, block_size, block_size])
+                    pygame.draw.circle(tile, (139, 159, 215), 
+                        [block_size / 2, block_size // 2], block_size // 2)
+                case '*':
+                    pygame.draw.rect(tile, (255, 255, 255), [0, 0, block_size, block_size])
+                    pygame.draw.circle(tile, (139, 159, 215), 
+                        [block_size / 2, block_size // 2], block_size // 2)
+                case 'B':
+                    pygame.draw.rect(tile, (215, 157, 139), [0, 0, block_size, block_size])
+                    pygame.draw.rect(tile, (50, 50, 50), [0, 0, block_size, block_size], 1)
+                case 'X':
+                    pygame.draw.rect(tile, (255, 255, 255), [0, 0, block_size, block_size])
+                    text = self.font.render("X", True, (229, 43, 80))
+                    text_rect = text.get_rect()
+                    text_rect.center = (block_size // 2, block_size // 2)
+                    tile.blit(text, text_rect)
+                case '+':
+                    pygame.draw.rect(tile, (241, 221, 215), [0, 0, block_size, block_size])
+                    pygame.draw.rect(tile, (50, 50, 50), [0, 0, block_size, block_size], 1)
+            tiles[symbol] = tile
+        return tiles
+
+    def Draw_Frame(self, frame):
         start_x = self.width // 2 - self.map_cols * self.block_size // 2 
         start_y = self.height // 2 - self.map_rows * self.block_size // 2 
-        for row in range(self.map_rows):
-            for col in range(self.map_cols):
-                x = start_x + col * self.block_size
-                y = start_y + row * self.block_size
-                match map[row][col]:
-                    case ' ':
-                        continue
-                    case '#':   
-                        pygame.draw.rect(self.surface, (0, 0, 0), [x, y, self.block_size, self.block_size])
-                    case '.':
-                        pygame.draw.rect(self.surface, (255, 255, 255), [x, y, self.block_size, self.block_size])
-                    case '@':
-                        pygame.draw.rect(self.surface, (255, 255, 255), [x, y, self.block_size, self.block_size])
-                        pygame.draw.circle(self.surface, (139, 159, 215), 
-                            [x + self.block_size / 2, y + self.block_size // 2], self.block_size // 2)
-                    case '*':
-                        pygame.draw.rect(self.surface, (255, 255, 255), [x, y, self.block_size, self.block_size])
-                        pygame.draw.circle(self.surface, (139, 159, 215), 
-                            [x + self.block_size / 2, y + self.block_size // 2], self.block_size // 2)
-                    case 'B':
-                        pygame.draw.rect(self.surface, (215, 157, 139), [x, y, self.block_size, self.block_size])
-                        pygame.draw.rect(self.surface, (50, 50, 50), [x, y, self.block_size, self.block_size], 1)
-                    case 'X':
-                        pygame.draw.rect(self.surface, (255, 255, 255), [x, y, self.block_size, self.block_size])
-                        text = self.font.render("X", True, (229, 43, 80))
-                        text_rect = text.get_rect()
-                        text_rect.center = (x + self.block_size // 2, y + self.block_size // 2)
-                        self.surface.blit(text, text_rect)
-                    case '+':
-                        pygame.draw.rect(self.surface, (241, 221, 215), [x, y, self.block_size, self.block_size])
-                        pygame.draw.rect(self.surface, (50, 50, 50), [x, y, self.block_size, self.block_size], 1)
+        rects = list()
+        for (col, row), symbol in frame:
+            if symbol == ' ':
+                continue
+            x = start_x + col * self.block_size
+            y = start_y + row * self.block_size
+            rects.append(self.surface.blit(self.tiles[symbol], (x, y)))
+        return rects
 
     def Draw_Menu(self):
         self.surface.fill((62, 180, 137))
@@ -535,6 +264,32 @@ class Game:
         algo_rect = algo_text.get_rect(center=(center_x, self.height // 3 * 2))
         self.surface.blit(algo_text, algo_rect)
 
+    def Draw_Progress(self):
+        self.surface.fill((62, 180, 137))
+        center_x = self.width // 2
+
+        stats = self.progress_stats or {
+            'iteration_count': 0, 'open_node_count': 0, 'search_depth': 0, 'nodes_per_sec': 0.0, 'elapsed': 0.0
+        }
+        lines = [
+            f"Поиск решения: {os.path.splitext(self.selected_level)[0]}",
+            f"Алгоритм: {self.algorithms[self.algorithm_index]}",
+            f"Количество итераций: {stats['iteration_count']}",
+            f"Количество узлов в O: {stats['open_node_count']}",
+            f"Глубина поиска: {stats['search_depth']}",
+            f"Узлов в секунду: {stats['nodes_per_sec']:.0f}",
+            f"Прошло времени: {stats['elapsed']:.1f} с",
+            "Esc - отменить поиск"
+        ]
+
+        start_y = self.height // 6
+        line_spacing = self.height // 12
+
+        for i, text in enumerate(lines):
+            rendered = self.stats_font.render(text, True, (0, 0, 0))
+            rect = rendered.get_rect(center=(center_x, start_y + i * line_spacing))
+            self.surface.blit(rendered, rect)
+
     def Draw_Stats(self):
         self.surface.fill((62, 180, 137))
         center_x = self.width // 2
@@ -545,8 +300,14 @@ class Game:
             f"Максимальное количество узлов в O: {self.O_max_node_count}",
             f"Конечное количество узлов в O: {self.O_end_node_count}",
             f"Максимальное количество узлов в памяти: {self.max_node_count}",
-            f"Количество шагов: {self.steps_counter}"
+            f"Количество шагов: {self.steps_counter}",
+            f"Отсечено по мёртвым клеткам: {self.dead_square_pruned}",
+            f"Отсечено по заморозке ящиков: {self.freeze_pruned}"
         ]
+        if self.stop_reason is not None:
+            lines.insert(0, f"Поиск остановлен: {self.stop_reasons[self.stop_reason]}")
+        if self.cached:
+            lines.insert(0, "Решение взято из кэша")
 
         start_y = self.height // 6
         line_spacing = self.height // 12
@@ -565,5 +326,6 @@ class Game:
         self.surface.blit(error, error_rect)
 
 
-game = Game()
-game.Start()
\ No newline at end of file
+if __name__ == '__main__':
+    game = Game()
+    game.Start()
@@ -0,0 +1,62 @@
+from array import array
+
+class NodeStore:
+    def __init__(self, record_size, capacity = 1 << 10):
+        size = 1
+        while size < 2 * capacity:
+            size <<= 1
+        self.record_size = record_size
+        self.records = bytearray()
+        self.keys = array('Q')
+        self.parents = array('i')
+        self.mask = size - 1
+        self.slots = array('i', [-1]) * size
+
+    def __len__(self):
+        return len(self.parents)
+
+    def Add(self, record, key, parent):
+        slots = self.slots
+        keys = self.keys
+        mask = self.mask
+        slot = key & mask
+        while True:
+            index = slots[slot]
+            if index < 0:
+                break
+            if keys[index] == key and self.Record(index) == record:
+                return -1
+            slot = (slot + 1) & mask
+
+        index = len(self.parents)
+        slots[slot] = index
+        self.records += record
+        keys.append(key)
+        self.parents.append(parent)
+        if 2 * len(self.parents) > len(slots):
+            self.Grow()
+        return index
+
+    def Grow(self):
+        size = 2 * len(self.slots)
+        mask = size - 1
+        slots = array('i', [-1]) * size
+        for index, key in enumerate(self.keys):
+            slot = key & mask
+            while slots[slot] >= 0:
+                slot = (slot + 1) & mask
+            slots[slot] = index
+        self.slots = slots
+        self.mask = mask
+
+    def Record(self, index):
+        offset = index * self.record_size
+        return bytes(self.records[offset:offset + self.record_size])
+
+    def Path(self, index):
+        path = list()
+        while index >= 0:
+            path.append(index)
+            index = self.parents[index]
+        path.reverse()
+        return path
@@ -0,0 +1,70 @@
+import random
+
+class PackedState:
+    __slots__ = ('player', 'boxes', 'prev_state', 'hash')
+
+    def __init__(self, player, boxes, key, prev_state = None):
+        self.player = player
+        self.boxes = boxes
+        self.prev_state = prev_state
+        self.hash = key
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        return self.player == other.player and self.boxes == other.boxes
+
+    def __hash__(self):
+        return self.hash
+
+class BoxView:
+    __slots__ = ('level', 'boxes')
+
+    def __init__(self, level, boxes):
+        self.level = level
+        self.boxes = boxes
+
+    def __contains__(self, cell):
+        index = self.level.index.get(cell)
+        return index is not None and (self.boxes >> index) & 1 == 1
+
+class PackedLevel:
+    zobrist_seed = 0x5eed
+
+    def __init__(self, level):
+        self.cells = level.cells
+        self.index = level.index
+        self.neighbors = level.neighbors
+
+        generator = random.Random(self.zobrist_seed)
+        self.player_keys = [generator.getrandbits(64) for _ in self.cells]
+        self.box_keys = [generator.getrandbits(64) for _ in self.cells]
+
+    def Zobrist(self, player, boxes):
+        key = 0 if player < 0 else self.player_keys[player]
+        while boxes:
+            low_bit = boxes & -boxes
+            key ^= self.box_keys[low_bit.bit_length() - 1]
+            boxes ^= low_bit
+        return key
+
+    def Pack(self, state):
+        boxes = 0
+        for box in state.boxes:
+            boxes |= 1 << self.index[box]
+        player = -1 if state.player is None else self.index[state.player]
+        return PackedState(player, boxes, self.Zobrist(player, boxes))
+
+    def Unpack(self, packed_state):
+        return self.cells[packed_state.player], self.Box_Cells(packed_state.boxes)
+
+    def Box_Cells(self, boxes):
+        cells = list()
+        while boxes:
+            low_bit = boxes & -boxes
+            cells.append(self.cells[low_bit.bit_length() - 1])
+            boxes ^= low_bit
+        return cells
+
+    def View(self, boxes):
+        return BoxView(self, boxes)
@@ -0,0 +1,190 @@
+import argparse
+import math
+import multiprocessing
+import os
+import time
+import solver
+from packed import PackedState
+
+class RecordCodec:
+    def __init__(self, level):
+        self.box_bytes = (len(level.cells) + 7) // 8
+        self.size = 2 + self.box_bytes
+
+    def Encode(self, player, boxes):
+        return player.to_bytes(2, 'little') + boxes.to_bytes(self.box_bytes, 'little')
+
+    def Decode(self, record):
+        return int.from_bytes(record[:2], 'little'), int.from_bytes(record[2:], 'little')
+
+def Worker(connection, levels_dir, level_name, count, pruning, heuristic, goal, cache_dir, use_heuristic):
+    worker_solver = solver.Solver(levels_dir, pruning, heuristic, goal=goal, cache_dir=cache_dir)
+    _, final_state = worker_solver.Load_Level(level_name)
+    level = worker_solver.Pack_Level()
+    final_state = level.Pack(final_state)
+    codec = RecordCodec(level)
+    record_size = codec.size
+    entry_size = 2 * record_size + 4
+
+    C = dict()
+    O = dict()
+    open_size = 0
+
+    while True:
+        command, argument = connection.recv()
+        match command:
+            case 'insert':
+                for offset in range(0, len(argument), entry_size):
+                    record = argument[offset:offset + record_size]
+                    parent = argument[offset + record_size:offset + 2 * record_size]
+                    g = int.from_bytes(argument[offset + 2 * record_size:offset + entry_size], 'little')
+                    if record in C and C[record][0] <= g:
+                        continue
+                    player, boxes = codec.Decode(record)
+                    h = worker_solver.Heuristic(level.Box_Cells(boxes)) if use_heuristic else 0
+                    if h == math.inf:
+                        continue
+                    C[record] = (g, parent)
+                    O.setdefault(g + h, list()).append((record, g))
+                    open_size += 1
+                connection.send((min(O) if O else None, len(C), open_size))
+
+            case 'expand':
+                batches = [bytearray() for _ in range(count)]
+                found = None
+                expanded = 0
+                for record, g in O.pop(argument, list()):
+                    open_size -= 1
+                    if C[record][0] != g:
+                        continue
+                    expanded += 1
+                    player, boxes = codec.Decode(record)
+                    state = PackedState(player, boxes, level.Zobrist(player, boxes))
+                    if worker_solver.Is_Goal(state, final_state):
+                        found = record
+                        break
+                    for new_state in worker_solver.Packed_Successors(level, state):
+                        batch = batches[new_state.hash % count]
+                        batch += codec.Encode(new_state.player, new_state.boxes)
+                        batch += record
+                        batch += (g + 1).to_bytes(4, 'little')
+                connection.send((found, expanded, [bytes(batch) for batch in batches]))
+
+            case 'parent':
+                connection.send(C[argument][1])
+
+            case 'stats':
+                connection.send((worker_solver.dead_square_pruned, worker_solver.freeze_pruned,
+                                 worker_solver.generated_count))
+
+            case 'stop':
+                connection.close()
+                return
+
+def Parallel_Search(owner, level_name, use_heuristic, workers):
+    start_state, final_state = owner.Load_Level(level_name)
+    level = owner.Pack_Level()
+    codec = RecordCodec(level)
+    start_state = level.Pack(start_state)
+
+    connections = list()
+    processes = list()
+    for _ in range(workers):
+        parent_end, child_end = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=Worker, args=(
+            child_end, owner.levels_dir, level_name, workers,
+            owner.pruning, owner.heuristic, owner.goal, owner.level_cache.cache_dir, use_heuristic))
+        process.start()
+        connections.append(parent_end)
+        processes.append(process)
+
+    def Owner_Of(record):
+        player, boxes = codec.Decode(record)
+        return connections[level.Zobrist(player, boxes) % workers]
+
+    try:
+        start_record = codec.Encode(start_state.player, start_state.boxes)
+        incoming = [bytes() for _ in range(workers)]
+        incoming[start_state.hash % workers] = start_record + bytes(codec.size) + (0).to_bytes(4, 'little')
+        found = None
+
+        while found is None:
+            for connection, data in zip(connections, incoming):
+                connection.send(('insert', data))
+            replies = [connection.recv() for connection in connections]
+            bounds = [bound for bound, _, _ in replies if bound is not None]
+            open_size = sum(size for _, _, size in replies)
+            closed_size = sum(size for _, size, _ in replies)
+            owner.Count_Nodes(closed_size, open_size)
+            if not bounds:
+                break
+            bound = min(bounds)
+            owner.search_depth = bound
+            owner.Check_Budget(closed_size, open_size)
+
+            for connection in connections:
+                connection.send(('expand', bound))
+            incoming = [bytearray() for _ in range(workers)]
+            for connection in connections:
+                record, expanded, batches = connection.recv()
+                owner.iteration_count += expanded
+                if record is not None and found is None:
+                    found = record
+                for target, batch in enumerate(batches):
+                    incoming[target] += batch
+            incoming = [bytes(data) for data in incoming]
+            owner.O_end_node_count = open_size
+
+        for connection in connections:
+            connection.send(('stats', None))
+            dead_square_pruned, freeze_pruned, generated_count = connection.recv()
+            owner.dead_square_pruned += dead_square_pruned
+            owner.freeze_pruned += freeze_pruned
+            owner.generated_count += generated_count
+
+        if found is None:
+            return None
+
+        path = list()
+        record = found
+        while record != start_record:
+            path.append(record)
+            connection = Owner_Of(record)
+            connection.send(('parent', record))
+            record = connection.recv()
+        path.append(start_record)
+        path.reverse()
+        owner.steps_counter += len(path) - 1
+        return [solver.State(*level.Unpack(PackedState(*codec.Decode(record), 0))) for record in path]
+
+    finally:
+        for connection in connections:
+            connection.send(('stop', None))
+        for process in processes:
+            process.join()
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure scaling of the parallel search from 1 to N workers.')
+    parser.add_argument('--levels-dir', default='Levels')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--algorithm', default='parallel breadth-first search',
+                        choices=['parallel breadth-first search', 'parallel A* search'])
+    args = parser.parse_args()
+
+    levels = sorted(f for f in os.listdir(args.levels_dir) if f.endswith('.txt'))
+    print(f"{'level':<16} {'workers':>7} {'steps':>6} {'time':>9} {'speedup':>8} {'efficiency':>10}")
+    for level_name in levels:
+        base_time = None
+        for workers in range(1, args.workers + 1):
+            owner = solver.Solver(args.levels_dir, workers=workers)
+            start_time = time.perf_counter()
+            result = owner.Solve(level_name, args.algorithm)
+            elapsed = time.perf_counter() - start_time
+            if base_time is None:
+                base_time = elapsed
+            speedup = base_time / elapsed
+            print(f"{os.path.splitext(level_name)[0]:<16} {workers:>7} {result.stats['steps_counter']:>6} "
+                  f"{elapsed:>8.3f}s {speedup:>7.2f}x {speedup / workers:>9.0%}")
+
+if __name__ == '__main__':
+    main()
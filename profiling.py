@@ -0,0 +1,163 @@
+import time
+import frontier
+from packed import PackedState
+from solver import State
+from transposition import TranspositionTable
+
+solver_phases = {
+    'Solve': 'solve',
+    'Run_Algorithm': 'search loop',
+    'Find_Solution': 'search loop',
+    'DFS_Iterative': 'search loop',
+    'Bidirectional_Search': 'search loop',
+    'Push_Search': 'search loop',
+    'A_Star': 'search loop',
+    'IDA_Star': 'search loop',
+    'Packed_Search': 'search loop',
+    'Packed_DFS_Iterative': 'search loop',
+    'Packed_IDA_Star': 'search loop',
+    'Compact_Search': 'search loop',
+    'Compact_DFS_Iterative': 'search loop',
+    'Fringe_Search': 'search loop',
+    'Load_Level': 'level loading',
+    'Pack_Level': 'level loading',
+    'Check_Direction': 'successor generation',
+    'Check_Direction_Backwards': 'successor generation',
+    'Move_Successors': 'successor generation',
+    'Push_Successors': 'successor generation',
+    'Macro_Pushes': 'successor generation',
+    'Box_Path': 'successor generation',
+    'Is_Room_Fillable': 'successor generation',
+    'Packed_Successors': 'successor generation',
+    'Compact_Successors': 'successor generation',
+    'Reachable': 'successor generation',
+    'Normalize_Player': 'successor generation',
+    'Is_Pruned_Push': 'deadlock pruning',
+    'Heuristic': 'heuristic',
+    'Is_Goal': 'goal test',
+    'Build_Path': 'path reconstruction',
+    'Connect_Ways': 'path reconstruction',
+    'Build_Push_Path': 'path reconstruction',
+    'Walk': 'path reconstruction',
+    'Path_To_Moves': 'path reconstruction',
+    'Check_Budget': 'bookkeeping'
+}
+
+class_phases = [
+    (State, '__hash__', 'hashing and membership'),
+    (State, '__eq__', 'hashing and membership'),
+    (PackedState, '__hash__', 'hashing and membership'),
+    (PackedState, '__eq__', 'hashing and membership'),
+    (TranspositionTable, 'Lookup', 'hashing and membership'),
+    (TranspositionTable, 'Store', 'hashing and membership'),
+    (frontier.QueueFrontier, 'Put', 'frontier'),
+    (frontier.QueueFrontier, 'Get', 'frontier'),
+    (frontier.StackFrontier, 'Put', 'frontier'),
+    (frontier.StackFrontier, 'Get', 'frontier'),
+    (frontier.HeapFrontier, 'Put', 'frontier'),
+    (frontier.HeapFrontier, 'Get', 'frontier'),
+    (frontier.BucketFrontier, 'Put', 'frontier'),
+    (frontier.BucketFrontier, 'Get', 'frontier')
+]
+
+class Profiler:
+    def __init__(self, solver):
+        self.solver = solver
+        self.phase_of = dict(solver_phases)
+        for cls, name, phase in class_phases:
+            self.phase_of[f'{cls.__name__}.{name}'] = phase
+        self.Reset()
+
+    def Reset(self):
+        self.stack = list()
+        self.stacks = dict()
+        self.calls = dict()
+        self.samples = list()
+        self.start_time = None
+        self.last_time = None
+        self.total_time = 0.0
+
+    def Enter(self, name):
+        now = time.perf_counter()
+        if self.stack:
+            key = tuple(self.stack)
+            self.stacks[key] = self.stacks.get(key, 0.0) + now - self.last_time
+        self.stack.append(name)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.last_time = now
+
+    def Leave(self):
+        now = time.perf_counter()
+        key = tuple(self.stack)
+        self.stacks[key] = self.stacks.get(key, 0.0) + now - self.last_time
+        self.stack.pop()
+        self.last_time = now
+
+    def Wrap(self, name, function):
+        def wrapper(*args, **kwargs):
+            self.Enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.Leave()
+        return wrapper
+
+    def Sample(self, function):
+        def wrapper(closed_size, open_size):
+            self.samples.append({
+                'time': time.perf_counter() - self.start_time,
+                'iteration_count': self.solver.iteration_count,
+                'closed_node_count': closed_size,
+                'open_node_count': open_size
+            })
+            return function(closed_size, open_size)
+        return wrapper
+
+    def __enter__(self):
+        self.Reset()
+        self.originals = list()
+        for name in solver_phases:
+            function = getattr(self.solver, name)
+            if name == 'Check_Budget':
+                function = self.Sample(function)
+            setattr(self.solver, name, self.Wrap(name, function))
+        for cls, name, _ in class_phases:
+            original = cls.__dict__[name]
+            self.originals.append((cls, name, original))
+            setattr(cls, name, self.Wrap(f'{cls.__name__}.{name}', original))
+        self.start_time = time.perf_counter()
+        self.last_time = self.start_time
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time = time.perf_counter() - self.start_time
+        for name in solver_phases:
+            delattr(self.solver, name)
+        for cls, name, original in self.originals:
+            setattr(cls, name, original)
+        return False
+
+    def Phases(self):
+        phases = dict()
+        for stack, seconds in self.stacks.items():
+            phase = self.phase_of[stack[-1]]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        return dict(sorted(phases.items(), key=lambda item: -item[1]))
+
+    def Report(self):
+        return {
+            'total_time': self.total_time,
+            'phases': self.Phases(),
+            'calls': dict(sorted(self.calls.items(), key=lambda item: -item[1])),
+            'stacks': {';'.join(stack): seconds for stack, seconds in sorted(self.stacks.items())},
+            'samples': self.samples
+        }
+
+def Write_Folded(profiles, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for profile in profiles:
+            prefix = f"{profile['level']};{profile['algorithm']};"
+            for stack, seconds in profile['stacks'].items():
+                microseconds = round(seconds * 1e6)
+                if microseconds > 0:
+                    f.write(f'{prefix}{stack} {microseconds}\n')
@@ -0,0 +1,33 @@
+move_delta = {
+    'u': (0, -1),
+    'd': (0,  1),
+    'l': (-1, 0),
+    'r': (1,  0)
+}
+
+def Cell_Symbol(map, cell, player, boxes):
+    x, y = cell
+    symbol = map[y][x]
+    if cell == player:
+        return '@' if symbol == '.' else '*'
+    if cell in boxes:
+        return 'B' if symbol == '.' else '+'
+    return symbol
+
+def Frames(map, start_state, moves):
+    player = start_state.player
+    boxes = set(start_state.boxes)
+    yield [((x, y), Cell_Symbol(map, (x, y), player, boxes))
+           for y in range(len(map)) for x in range(len(map[y]))]
+
+    for move in moves:
+        dx, dy = move_delta[move.lower()]
+        changed = [player]
+        player = (player[0] + dx, player[1] + dy)
+        changed.append(player)
+        if player in boxes:
+            box = (player[0] + dx, player[1] + dy)
+            boxes.remove(player)
+            boxes.add(box)
+            changed.append(box)
+        yield [(cell, Cell_Symbol(map, cell, player, boxes)) for cell in changed]
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import replay
+
+symmetries = [
+    lambda x, y, w, h: (x, y),
+    lambda x, y, w, h: (w - 1 - x, y),
+    lambda x, y, w, h: (x, h - 1 - y),
+    lambda x, y, w, h: (w - 1 - x, h - 1 - y),
+    lambda x, y, w, h: (y, x),
+    lambda x, y, w, h: (h - 1 - y, x),
+    lambda x, y, w, h: (y, w - 1 - x),
+    lambda x, y, w, h: (h - 1 - y, w - 1 - x)
+]
+
+def Transform_Moves(moves, symmetry, inverse = False):
+    letters = dict()
+    for letter, (dx, dy) in replay.move_delta.items():
+        x, y = symmetries[symmetry](dx, dy, 1, 1)
+        target = next(other for other, delta in replay.move_delta.items() if delta == (x, y))
+        if inverse:
+            letter, target = target, letter
+        letters[letter] = target
+        letters[letter.upper()] = target.upper()
+    return ''.join(letters[move] for move in moves)
+
+def Canonical_Layout(level, start_state):
+    best = None
+    for symmetry, transform in enumerate(symmetries):
+        cells = dict()
+        for y in range(level.rows):
+            for x in range(level.cols):
+                cells[transform(x, y, level.cols, level.rows)] = replay.Cell_Symbol(
+                    level.map, (x, y), start_state.player, start_state.boxes)
+        rows, cols = (level.cols, level.rows) if symmetry >= 4 else (level.rows, level.cols)
+        layout = '\n'.join(''.join(cells[(x, y)] for x in range(cols)) for y in range(rows))
+        if level.final_boxes is not None:
+            final_boxes = sorted(transform(x, y, level.cols, level.rows) for x, y in level.final_boxes)
+            final_player = None if level.final_player is None else transform(*level.final_player, level.cols, level.rows)
+            layout += f'\n{final_player}\n{final_boxes}'
+        if best is None or layout < best[0]:
+            best = (layout, symmetry)
+    return best
+
+class SolutionCache:
+    def __init__(self, path = '.solution_cache.json', capacity = 1000):
+        self.path = path
+        self.capacity = capacity
+        self.entries = self.Read()
+        self.changed = False
+
+    def Key(self, level, start_state, options):
+        layout, symmetry = Canonical_Layout(level, start_state)
+        key = hashlib.sha256(f'{options}\0{layout}'.encode('utf-8')).hexdigest()
+        return key, symmetry
+
+    def Lookup(self, level, start_state, options):
+        key, symmetry = self.Key(level, start_state, options)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.entries[key] = entry
+        self.changed = True
+        return Transform_Moves(entry['moves'], symmetry, inverse=True), entry['stats']
+
+    def Store(self, level, start_state, options, moves, stats):
+        key, symmetry = self.Key(level, start_state, options)
+        self.entries.pop(key, None)
+        self.entries[key] = {'moves': Transform_Moves(moves, symmetry), 'stats': stats}
+        while len(self.entries) > self.capacity:
+            del self.entries[next(iter(self.entries))]
+        self.Write()
+
+    def Read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as cache_file:
+                return dict(json.load(cache_file))
+        except (OSError, ValueError, TypeError):
+            return dict()
+
+    def Flush(self):
+        if self.changed:
+            self.Write()
+
+    def Write(self):
+        self.changed = False
+        try:
+            with open(self.path + '.tmp', 'w', encoding='utf-8') as cache_file:
+                json.dump(self.entries, cache_file)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError:
+            pass
@@ -0,0 +1,1196 @@
+import importlib.util
+import math
+import os
+import threading
+import time
+import external
+import parallel
+import replay
+import vectorized
+from frontier import Make_Frontier
+from level import LevelCache
+from nodestore import NodeStore
+from packed import PackedLevel, PackedState
+from transposition import TranspositionTable
+
+class State:
+    def __init__(self, player_pos, boxes, prev_state = None, depth = 0):
+        self.player = player_pos
+        self.boxes = frozenset(boxes)
+        self.prev_state = prev_state
+        self.depth = depth
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        return self.player == other.player and self.boxes == other.boxes
+
+    def __hash__(self):
+        return hash((self.player, self.boxes))
+
+class SearchStopped(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+class Result:
+    def __init__(self, level_name, algorithm, map, start_state, moves, stats, stop_reason = None, cached = False):
+        self.level = level_name
+        self.algorithm = algorithm
+        self.map = map
+        self.start = start_state
+        self.moves = moves
+        self.stats = stats
+        self.stop_reason = stop_reason
+        self.cached = cached
+
+    @property
+    def solved(self):
+        return self.moves is not None
+
+    def Frames(self):
+        return replay.Frames(self.map, self.start, self.moves)
+
+    def To_Dict(self):
+        result = {
+            'level': self.level,
+            'algorithm': self.algorithm,
+            'solved': self.solved,
+            'stopped': self.stop_reason,
+            'cached': self.cached,
+            'moves': self.moves
+        }
+        result.update(self.stats)
+        return result
+
+def Min_Cost_Matching(cost):
+    rows = len(cost)
+    cols = len(cost[0]) if rows else 0
+    if rows > cols:
+        return math.inf
+    u = [0] * (rows + 1)
+    v = [0] * (cols + 1)
+    match = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+    for i in range(1, rows + 1):
+        match[0] = i
+        j0 = 0
+        min_v = [math.inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            delta = math.inf
+            j1 = 0
+            for j in range(1, cols + 1):
+                if not used[j]:
+                    current = cost[i0 - 1][j - 1] - u[i0] - v[j]
+                    if current < min_v[j]:
+                        min_v[j] = current
+                        way[j] = j0
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        j1 = j
+            if delta == math.inf:
+                return math.inf
+            for j in range(cols + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    return sum(cost[match[j] - 1][j - 1] for j in range(1, cols + 1) if match[j])
+
+class Solver:
+    algorithms = ['depth-first search', 'iterative depth-first search', 'breadth-first search', 'bidirectional search',
+                  'push depth-first search', 'push breadth-first search',
+                  'macro push depth-first search', 'macro push breadth-first search',
+                  'A* search', 'IDA* search', 'weighted A* search', 'greedy best-first search',
+                  'packed depth-first search', 'packed breadth-first search',
+                  'packed iterative depth-first search', 'packed IDA* search',
+                  'parallel breadth-first search', 'parallel A* search',
+                  'external breadth-first search',
+                  'compact breadth-first search', 'compact iterative depth-first search',
+                  'fringe search'] + (['vectorized breadth-first search']
+                                      if importlib.util.find_spec('numpy') is not None else [])
+    heuristics = ['manhattan', 'matching']
+    goals = ['boxes', 'state']
+    delta = {
+        'up':    (0, -1),
+        'down':  (0,  1),
+        'left':  (-1, 0),
+        'right': (1,  0)
+    }
+    stop_reasons = ['cancelled', 'time budget', 'node budget']
+    move_letters = {
+        (0, -1): 'u',
+        (0,  1): 'd',
+        (-1, 0): 'l',
+        (1,  0): 'r'
+    }
+
+    def __init__(self, levels_dir = 'Levels', pruning = True, heuristic = 'matching', weight = 2.0,
+                 table_size = 1 << 20, table_policy = 'always', workers = os.cpu_count(), goal = 'boxes',
+                 cache_dir = '.level_cache', time_budget = None, node_budget = None, progress = None,
+                 progress_interval = 0.25, memory_budget = 64 << 20, external_dir = None, solution_cache = None):
+        if heuristic not in self.heuristics:
+            raise ValueError(f'Unknown heuristic: {heuristic}')
+        if goal not in self.goals:
+            raise ValueError(f'Unknown goal mode: {goal}')
+        self.levels_dir = levels_dir
+        self.pruning = pruning
+        self.heuristic = heuristic
+        self.weight = weight
+        self.table_size = table_size
+        self.table_policy = table_policy
+        self.workers = workers
+        self.goal = goal
+        self.level_cache = LevelCache(cache_dir)
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.memory_budget = memory_budget
+        self.external_dir = external_dir
+        self.solution_cache = solution_cache
+        self.cancelled = threading.Event()
+        self.level = None
+        self.map_rows = 0
+        self.map_cols = 0
+        self.map = list()
+        self.dead_squares = set()
+        self.targets = list()
+        self.goal_rooms = dict()
+        self.room_checks = dict()
+        self.push_distances = dict()
+        self.Reset_Stats()
+
+    def Reset_Stats(self):
+        self.iteration_count = 0
+        self.O_max_node_count = 0
+        self.O_end_node_count = 0
+        self.max_node_count = 0
+        self.steps_counter = 0
+        self.dead_square_pruned = 0
+        self.freeze_pruned = 0
+        self.table_overwrites = 0
+        self.generated_count = 0
+        self.search_depth = 0
+        self.start_time = time.perf_counter()
+        self.next_progress_time = self.start_time + self.progress_interval
+        self.budget_countdown = 1024 if self.node_budget is None else max(1, min(1024, self.node_budget))
+
+    def Stats(self):
+        return {
+            'iteration_count': self.iteration_count,
+            'generated_count': self.generated_count,
+            'O_max_node_count': self.O_max_node_count,
+            'O_end_node_count': self.O_end_node_count,
+            'max_node_count': self.max_node_count,
+            'steps_counter': self.steps_counter,
+            'dead_square_pruned': self.dead_square_pruned,
+            'freeze_pruned': self.freeze_pruned,
+            'table_overwrites': self.table_overwrites
+        }
+
+    def Solve(self, level_name, algorithm):
+        self.Reset_Stats()
+        result = self.Lookup_Solution(level_name, algorithm)
+        if result is not None:
+            return result
+        try:
+            path = self.Run_Algorithm(level_name, algorithm)
+            stop_reason = None
+        except SearchStopped as stopped:
+            path = None
+            stop_reason = stopped.reason
+        moves = None if path is None else self.Path_To_Moves(path)
+        start_state = State(self.level.player, self.level.boxes)
+        result = Result(level_name, algorithm, self.map, start_state, moves, self.Stats(), stop_reason)
+        if self.solution_cache is not None and result.solved:
+            self.solution_cache.Store(self.level, start_state, self.Solution_Options(algorithm), moves, result.stats)
+        return result
+
+    def Lookup_Solution(self, level_name, algorithm):
+        if self.solution_cache is None:
+            return None
+        start_state, _ = self.Load_Level(level_name)
+        cached = self.solution_cache.Lookup(self.level, start_state, self.Solution_Options(algorithm))
+        if cached is None:
+            return None
+        moves, stats = cached
+        return Result(level_name, algorithm, self.map, start_state, moves, stats, cached=True)
+
+    def Solution_Options(self, algorithm):
+        return f'{algorithm}|{self.goal}|{self.pruning}|{self.heuristic}|{self.weight}'
+
+    def Run_Algorithm(self, level_name, algorithm):
+        match algorithm:
+            case 'depth-first search':
+                path = self.Find_Solution(level_name, 'stack')
+            case 'iterative depth-first search':
+                path = self.DFS_Iterative(level_name)
+            case 'breadth-first search':
+                path = self.Find_Solution(level_name, 'queue')
+            case 'bidirectional search':
+                path = self.Bidirectional_Search(level_name)
+            case 'push depth-first search':
+                path = self.Push_Search(level_name, 'stack')
+            case 'push breadth-first search':
+                path = self.Push_Search(level_name, 'queue')
+            case 'macro push depth-first search':
+                path = self.Push_Search(level_name, 'stack', macros=True)
+            case 'macro push breadth-first search':
+                path = self.Push_Search(level_name, 'queue', macros=True)
+            case 'A* search':
+                path = self.A_Star(level_name, 1, 1)
+            case 'IDA* search':
+                path = self.IDA_Star(level_name)
+            case 'weighted A* search':
+                path = self.A_Star(level_name, 1, self.weight)
+            case 'greedy best-first search':
+                path = self.A_Star(level_name, 0, 1)
+            case 'packed depth-first search':
+                path = self.Packed_Search(level_name, 'stack')
+            case 'packed breadth-first search':
+                path = self.Packed_Search(level_name, 'queue')
+            case 'packed iterative depth-first search':
+                path = self.Packed_DFS_Iterative(level_name)
+            case 'packed IDA* search':
+                path = self.Packed_IDA_Star(level_name)
+            case 'parallel breadth-first search':
+                path = parallel.Parallel_Search(self, level_name, False, self.workers)
+            case 'parallel A* search':
+                path = parallel.Parallel_Search(self, level_name, True, self.workers)
+            case 'external breadth-first search':
+                path = external.External_Search(self, level_name, self.memory_budget, self.external_dir)
+            case 'compact breadth-first search':
+                path = self.Compact_Search(level_name)
+            case 'compact iterative depth-first search':
+                path = self.Compact_DFS_Iterative(level_name)
+            case 'fringe search':
+                path = self.Fringe_Search(level_name)
+            case 'vectorized breadth-first search':
+                path = vectorized.Vector_Search(self, level_name)
+            case _:
+                raise ValueError(f'Unknown algorithm: {algorithm}')
+        return path
+
+    def Cancel(self):
+        self.cancelled.set()
+
+    def Count_Nodes(self, closed_size, open_size):
+        if open_size > self.O_max_node_count:
+            self.O_max_node_count = open_size
+        if closed_size + open_size > self.max_node_count:
+            self.max_node_count = closed_size + open_size
+        self.budget_countdown -= 1
+        if self.budget_countdown <= 0:
+            self.Check_Budget(closed_size, open_size)
+
+    def Check_Budget(self, closed_size, open_size):
+        self.budget_countdown = 1024
+        if self.node_budget is not None:
+            self.budget_countdown = max(1, min(1024, self.node_budget - self.iteration_count))
+        now = time.perf_counter()
+        if self.progress is not None and now >= self.next_progress_time:
+            self.next_progress_time = now + self.progress_interval
+            self.progress(self.Progress(closed_size, open_size, now))
+        if self.cancelled.is_set():
+            raise SearchStopped('cancelled')
+        if self.time_budget is not None and now - self.start_time >= self.time_budget:
+            raise SearchStopped('time budget')
+        if self.node_budget is not None and self.iteration_count >= self.node_budget:
+            raise SearchStopped('node budget')
+
+    def Progress(self, closed_size, open_size, now):
+        elapsed = now - self.start_time
+        return {
+            'iteration_count': self.iteration_count,
+            'open_node_count': open_size,
+            'closed_node_count': closed_size,
+            'search_depth': self.search_depth,
+            'elapsed': elapsed,
+            'nodes_per_sec': self.iteration_count / elapsed if elapsed > 0 else 0.0
+        }
+
+    def Level_Path(self, level_name):
+        return os.path.join(self.levels_dir, level_name)
+
+    def Final_State_Path(self, level_name):
+        return os.path.join(self.levels_dir, 'Final states', level_name)
+
+    def Find_Solution(self, level_name, structure_type):
+        start_state, final_state = self.Load_Level(level_name)
+
+        O = Make_Frontier(structure_type)
+        O.Put(start_state)
+        C = {start_state}
+        directions = ['up', 'down', 'right', 'left']
+
+        while O:
+            self.iteration_count += 1
+            self.Count_Nodes(len(C), len(O))
+            state = O.Get()
+            if state.depth > self.search_depth:
+                self.search_depth = state.depth
+            if self.Is_Goal(state, final_state):
+                self.O_end_node_count = len(O)
+                return self.Build_Path(state)
+
+            for direction in directions:
+                new_state = self.Check_Direction(direction, state)
+                if new_state != None:
+                    if not new_state in C:
+                        O.Put(new_state)
+                        C.add(new_state)
+
+        return None
+
+    def DFS_Iterative(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+
+        directions = ['up', 'down', 'right', 'left']
+        O = Make_Frontier('stack')
+        cur_depth = 1
+        max_depth = 10000
+
+        while True:
+            self.search_depth = cur_depth
+            O.Put(start_state)
+            C = {start_state: start_state.depth}
+            while O:
+                self.iteration_count += 1
+                self.Count_Nodes(len(C), len(O))
+                state = O.Get()
+                if self.Is_Goal(state, final_state):
+                    self.O_end_node_count = len(O)
+                    return self.Build_Path(state)
+
+                if state.depth < cur_depth:
+                    for direction in directions:
+                        new_state = self.Check_Direction(direction, state)
+                        if new_state != None:
+                            new_state.depth = state.depth + 1
+                            if not new_state in C or new_state.depth < C[new_state]:
+                                O.Put(new_state)
+                                C[new_state] = new_state.depth
+
+            cur_depth += 1
+            if cur_depth >= max_depth:
+                break
+
+        return None
+
+    def Bidirectional_Search(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+
+        O_start = Make_Frontier('queue')
+        O_start.Put(start_state)
+        C_start = {start_state: start_state}
+
+        O_final = Make_Frontier('queue')
+        C_final = dict()
+        for y in range(self.map_rows):
+            for x in range(self.map_cols):
+                goal_state = State((x, y), final_state.boxes)
+                if self.Is_Free((x, y), final_state.boxes) and self.Is_Goal(goal_state, final_state):
+                    O_final.Put(goal_state)
+                    C_final[goal_state] = goal_state
+
+        if start_state in C_final:
+            return self.Connect_Ways(start_state, C_final[start_state])
+
+        directions = ['up', 'down', 'right', 'left']
+        depths = {True: 0, False: 0}
+
+        while O_start and O_final:
+            forward = len(O_start) <= len(O_final)
+            if forward:
+                O, C, C_other = O_start, C_start, C_final
+            else:
+                O, C, C_other = O_final, C_final, C_start
+
+            best = None
+            for _ in range(len(O)):
+                self.iteration_count += 1
+                self.Count_Nodes(len(C_start) + len(C_final), len(O_start) + len(O_final))
+                state = O.Get()
+                if state.depth > depths[forward]:
+                    depths[forward] = state.depth
+                    self.search_depth = depths[True] + depths[False]
+                if forward:
+                    new_states = [self.Check_Direction(direction, state) for direction in directions]
+                else:
+                    new_states = [new_state for direction in directions
+                                  for new_state in self.Check_Direction_Backwards(direction, state)]
+
+                for new_state in new_states:
+                    if new_state is None or new_state in C:
+                        continue
+                    new_state.depth = state.depth + 1
+                    O.Put(new_state)
+                    C[new_state] = new_state
+                    if new_state in C_other:
+                        length = new_state.depth + C_other[new_state].depth
+                        if best is None or length < best[0]:
+                            best = (length, new_state, C_other[new_state])
+
+            if best is not None:
+                self.O_end_node_count = len(O_start) + len(O_final)
+                _, node, other_node = best
+                if forward:
+                    return self.Connect_Ways(node, other_node)
+                return self.Connect_Ways(other_node, node)
+
+        return None
+
+    def Load_Level(self, level_name):
+        final_path = self.Final_State_Path(level_name) if self.goal == 'state' else None
+        self.level = self.level_cache.Load(self.Level_Path(level_name), final_path)
+        self.map_rows = self.level.rows
+        self.map_cols = self.level.cols
+        self.map = self.level.map
+        self.dead_squares = self.level.dead_squares
+        self.targets = self.level.targets
+        self.push_distances = self.level.push_distances
+        self.goal_rooms = self.level.goal_rooms if self.goal == 'boxes' else dict()
+
+        start_state = State(self.level.player, self.level.boxes)
+        if self.goal == 'boxes':
+            return start_state, State(None, self.targets)
+        return start_state, State(self.level.final_player, self.level.final_boxes)
+
+    def Is_Goal(self, state, final_state):
+        if state.boxes != final_state.boxes:
+            return False
+        return self.goal == 'boxes' or state.player == final_state.player
+
+    def Push_Search(self, level_name, structure_type, macros = False):
+        start_state, final_state = self.Load_Level(level_name)
+        start_player = start_state.player
+        start_state = State(self.Normalize_Player(start_player, start_state.boxes), start_state.boxes)
+        self.room_checks = dict()
+
+        O = Make_Frontier(structure_type)
+        O.Put(start_state)
+        C = {start_state}
+
+        while O:
+            self.iteration_count += 1
+            self.Count_Nodes(len(C), len(O))
+            state = O.Get()
+            if state.depth > self.search_depth:
+                self.search_depth = state.depth
+            reachable = self.Reachable(state.player, state.boxes)
+            if state.boxes == final_state.boxes and (self.goal == 'boxes' or final_state.player in reachable):
+                self.O_end_node_count = len(O)
+                return self.Build_Push_Path(start_player, state, final_state.player)
+
+            for new_state in self.Push_Successors(state, reachable, macros):
+                if not new_state in C:
+                    O.Put(new_state)
+                    C.add(new_state)
+
+        return None
+
+    def Push_Successors(self, state, reachable, macros = False):
+        successors = list()
+        for box in state.boxes:
+            bx, by = box
+            for dx, dy in self.delta.values():
+                if (bx - dx, by - dy) not in reachable:
+                    continue
+                nbx, nby = bx + dx, by + dy
+                if not self.Is_Free((nbx, nby), state.boxes):
+                    continue
+                if macros:
+                    pushes = self.Macro_Pushes(box, (nbx, nby), state.boxes)
+                else:
+                    pushes = [(box, (nbx, nby))]
+                for player, cell in pushes:
+                    boxes = set(state.boxes)
+                    boxes.remove(box)
+                    boxes.add(cell)
+                    if self.Is_Pruned_Push(cell, boxes):
+                        continue
+                    successors.append(State(self.Normalize_Player(player, boxes), boxes, state, state.depth + 1))
+        self.generated_count += len(successors)
+        return successors
+
+    def Macro_Pushes(self, box, cell, boxes):
+        others = boxes - {box}
+        player = box
+        dx, dy = cell[0] - box[0], cell[1] - box[1]
+        while self.Is_Tunnel(player, dx, dy) and self.Is_Tunnel(cell, dx, dy) and not self.Is_Target(cell):
+            next_cell = (cell[0] + dx, cell[1] + dy)
+            if not self.Is_Free(next_cell, others) or next_cell in self.dead_squares:
+                break
+            player, cell = cell, next_cell
+
+        if cell not in self.goal_rooms:
+            return [(player, cell)]
+        order, room = self.goal_rooms[cell]
+        free = [target for target in order if target not in others]
+        if not free:
+            return [(player, cell)]
+        path = self.Box_Path(cell, free[0], others, player, room)
+        if path is None or not self.Is_Room_Fillable(cell, player, others & room | {free[0]}, free[1:]):
+            return [(player, cell)]
+        return [(path[-2], free[0])]
+
+    def Is_Room_Fillable(self, entrance, player, boxes, free):
+        key = (entrance, player, boxes)
+        if key not in self.room_checks:
+            _, room = self.goal_rooms[entrance]
+            fillable = True
+            for target in free:
+                if self.Box_Path(entrance, target, boxes, player, room) is None:
+                    fillable = False
+                    break
+                boxes = boxes | {target}
+            self.room_checks[key] = fillable
+        return self.room_checks[key]
+
+    def Is_Tunnel(self, cell, dx, dy):
+        x, y = cell
+        return not self.Is_Floor((x + dy, y + dx)) and not self.Is_Floor((x - dy, y - dx))
+
+    def Box_Path(self, box, target, others, player, cells = None):
+        start = (box, player)
+        parents = {start: None}
+        frontier = Make_Frontier('queue')
+        frontier.Put(start)
+        while frontier:
+            node = frontier.Get()
+            cell, player = node
+            if cell == target:
+                pushes = list()
+                while node is not None:
+                    pushes.append(node[0])
+                    node = parents[node]
+                pushes.reverse()
+                return pushes
+
+            x, y = cell
+            reachable = self.Reachable(player, others | {cell})
+            for dx, dy in self.delta.values():
+                next_cell = (x + dx, y + dy)
+                if (x - dx, y - dy) not in reachable or not self.Is_Free(next_cell, others):
+                    continue
+                if next_cell in self.dead_squares or cells is not None and next_cell not in cells:
+                    continue
+                new_node = (next_cell, cell)
+                if new_node not in parents:
+                    parents[new_node] = node
+                    frontier.Put(new_node)
+        return None
+
+    def A_Star(self, level_name, g_weight, h_weight):
+        start_state, final_state = self.Load_Level(level_name)
+
+        if float(g_weight).is_integer() and float(h_weight).is_integer():
+            O = Make_Frontier('bucket')
+            g_weight, h_weight = int(g_weight), int(h_weight)
+        else:
+            O = Make_Frontier('heap')
+        h = self.Heuristic(start_state.boxes)
+        if h == math.inf:
+            return None
+        O.Put(start_state, h_weight * h)
+        C = {start_state: start_state.depth}
+
+        while O:
+            self.Count_Nodes(len(C), len(O))
+            state = O.Get()
+            if state.depth > C[state]:
+                continue
+            self.iteration_count += 1
+            if state.depth > self.search_depth:
+                self.search_depth = state.depth
+            if self.Is_Goal(state, final_state):
+                self.O_end_node_count = len(O)
+                return self.Build_Path(state)
+
+            for new_state in self.Move_Successors(state):
+                if new_state in C and C[new_state] <= new_state.depth:
+                    continue
+                h = self.Heuristic(new_state.boxes)
+                if h == math.inf:
+                    continue
+                O.Put(new_state, g_weight * new_state.depth + h_weight * h)
+                C[new_state] = new_state.depth
+
+        return None
+
+    def IDA_Star(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+
+        C = TranspositionTable(self.table_size, self.table_policy)
+
+        threshold = self.Heuristic(start_state.boxes)
+        while threshold < math.inf:
+            self.search_depth = threshold
+            next_threshold = math.inf
+            C.New_Generation()
+            O = Make_Frontier('stack')
+            O.Put(start_state)
+            C.Store(hash(start_state) % (1 << 64), start_state.depth)
+            while O:
+                self.iteration_count += 1
+                self.Count_Nodes(C.count, len(O))
+                state = O.Get()
+                if self.Is_Goal(state, final_state):
+                    self.O_end_node_count = len(O)
+                    self.table_overwrites = C.overwrites
+                    return self.Build_Path(state)
+
+                for new_state in self.Move_Successors(state):
+                    key = hash(new_state) % (1 << 64)
+                    stored_depth = C.Lookup(key)
+                    if stored_depth is not None and stored_depth <= new_state.depth:
+                        continue
+                    f = new_state.depth + self.Heuristic(new_state.boxes)
+                    if f > threshold:
+                        next_threshold = min(next_threshold, f)
+                        continue
+                    O.Put(new_state)
+                    C.Store(key, new_state.depth)
+            threshold = next_threshold
+
+        self.table_overwrites = C.overwrites
+        return None
+
+    def Packed_Search(self, level_name, structure_type):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+
+        O = Make_Frontier(structure_type)
+        O.Put((start_state, 0))
+        C = {start_state}
+
+        while O:
+            self.iteration_count += 1
+            self.Count_Nodes(len(C), len(O))
+            state, depth = O.Get()
+            if depth > self.search_depth:
+                self.search_depth = depth
+            if self.Is_Goal(state, final_state):
+                self.O_end_node_count = len(O)
+                return [State(*level.Unpack(packed_state)) for packed_state in self.Build_Path(state)]
+
+            for new_state in self.Packed_Successors(level, state):
+                if not new_state in C:
+                    O.Put((new_state, depth + 1))
+                    C.add(new_state)
+
+        return None
+
+    def Packed_DFS_Iterative(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+        C = TranspositionTable(self.table_size, self.table_policy)
+
+        cur_depth = 1
+        max_depth = 10000
+
+        while True:
+            self.search_depth = cur_depth
+            C.New_Generation()
+            O = Make_Frontier('stack')
+            O.Put((start_state, 0))
+            C.Store(start_state.hash, 0)
+            while O:
+                self.iteration_count += 1
+                self.Count_Nodes(C.count, len(O))
+                state, depth = O.Get()
+                if self.Is_Goal(state, final_state):
+                    self.O_end_node_count = len(O)
+                    self.table_overwrites = C.overwrites
+                    return [State(*level.Unpack(packed_state)) for packed_state in self.Build_Path(state)]
+
+                if depth < cur_depth:
+                    for new_state in self.Packed_Successors(level, state):
+                        stored_depth = C.Lookup(new_state.hash)
+                        if stored_depth is None or depth + 1 < stored_depth:
+                            O.Put((new_state, depth + 1))
+                            C.Store(new_state.hash, depth + 1)
+
+            cur_depth += 1
+            if cur_depth >= max_depth:
+                break
+
+        self.table_overwrites = C.overwrites
+        return None
+
+    def Packed_IDA_Star(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+        C = TranspositionTable(self.table_size, self.table_policy)
+
+        threshold = self.Heuristic(level.Box_Cells(start_state.boxes))
+        while threshold < math.inf:
+            self.search_depth = threshold
+            next_threshold = math.inf
+            C.New_Generation()
+            O = Make_Frontier('stack')
+            O.Put((start_state, 0))
+            C.Store(start_state.hash, 0)
+            while O:
+                self.iteration_count += 1
+                self.Count_Nodes(C.count, len(O))
+                state, depth = O.Get()
+                if self.Is_Goal(state, final_state):
+                    self.O_end_node_count = len(O)
+                    self.table_overwrites = C.overwrites
+                    return [State(*level.Unpack(packed_state)) for packed_state in self.Build_Path(state)]
+
+                for new_state in self.Packed_Successors(level, state):
+                    stored_depth = C.Lookup(new_state.hash)
+                    if stored_depth is not None and stored_depth <= depth + 1:
+                        continue
+                    f = depth + 1 + self.Heuristic(level.Box_Cells(new_state.boxes))
+                    if f > threshold:
+                        next_threshold = min(next_threshold, f)
+                        continue
+                    O.Put((new_state, depth + 1))
+                    C.Store(new_state.hash, depth + 1)
+            threshold = next_threshold
+
+        self.table_overwrites = C.overwrites
+        return None
+
+    def Pack_Level(self):
+        return PackedLevel(self.level)
+
+    def Fringe_Search(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+
+        h = self.Heuristic(level.Box_Cells(start_state.boxes))
+        if h == math.inf:
+            return None
+        C = {start_state: (0, h, start_state)}
+        later = [start_state]
+        threshold = h
+
+        while later:
+            self.search_depth = threshold
+            now = later
+            now.reverse()
+            later = list()
+            next_threshold = math.inf
+            while now:
+                self.Count_Nodes(len(C), len(now) + len(later))
+                state = now.pop()
+                g, h, current = C[state]
+                if current is not state:
+                    continue
+                if g + h > threshold:
+                    later.append(state)
+                    next_threshold = min(next_threshold, g + h)
+                    continue
+                self.iteration_count += 1
+                if self.Is_Goal(state, final_state):
+                    self.O_end_node_count = len(now) + len(later)
+                    return [State(*level.Unpack(packed_state)) for packed_state in self.Build_Path(state)]
+
+                for new_state in reversed(self.Packed_Successors(level, state)):
+                    if new_state in C:
+                        new_g, new_h, _ = C[new_state]
+                        if new_g <= g + 1:
+                            continue
+                    else:
+                        new_h = self.Heuristic(level.Box_Cells(new_state.boxes))
+                        if new_h == math.inf:
+                            continue
+                    C[new_state] = (g + 1, new_h, new_state)
+                    now.append(new_state)
+            threshold = next_threshold
+
+        return None
+
+    def Compact_Search(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        codec = parallel.RecordCodec(level)
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+
+        C = NodeStore(codec.size)
+        C.Add(codec.Encode(start_state.player, start_state.boxes), start_state.hash, -1)
+        head = 0
+        layer_end = len(C)
+
+        while head < len(C):
+            if head == layer_end:
+                self.search_depth += 1
+                layer_end = len(C)
+            self.iteration_count += 1
+            self.Count_Nodes(head, len(C) - head)
+            index = head
+            head += 1
+            state = PackedState(*codec.Decode(C.Record(index)), C.keys[index])
+            if self.Is_Goal(state, final_state):
+                self.O_end_node_count = len(C) - head
+                path = C.Path(index)
+                self.steps_counter += len(path) - 1
+                return [State(*level.Unpack(PackedState(*codec.Decode(C.Record(i)), 0))) for i in path]
+
+            for cell, boxes, key in self.Compact_Successors(level, state.player, state.boxes, state.hash):
+                C.Add(codec.Encode(cell, boxes), key, index)
+
+        return None
+
+    def Compact_DFS_Iterative(self, level_name):
+        start_state, final_state = self.Load_Level(level_name)
+        level = self.Pack_Level()
+        start_state = level.Pack(start_state)
+        final_state = level.Pack(final_state)
+        C = TranspositionTable(self.table_size, self.table_policy)
+
+        cur_depth = 0
+        max_depth = 10000
+
+        while cur_depth < max_depth:
+            self.search_depth = cur_depth
+            C.New_Generation()
+            C.Store(start_state.hash, 0)
+            path = [(start_state.player, start_state.boxes, start_state.hash)]
+            successors = [None]
+            self.iteration_count += 1
+            while path:
+                self.Count_Nodes(C.count, len(path))
+                player, boxes, key = path[-1]
+                depth = len(path) - 1
+                if successors[-1] is None:
+                    if self.Is_Goal(PackedState(player, boxes, key), final_state):
+                        self.O_end_node_count = len(path)
+                        self.table_overwrites = C.overwrites
+                        self.steps_counter += len(path) - 1
+                        return [State(*level.Unpack(PackedState(player, boxes, key))) for player, boxes, key in path]
+                    successors[-1] = self.Compact_Successors(level, player, boxes, key) if depth < cur_depth else []
+
+                while successors[-1]:
+                    new_state = successors[-1].pop()
+                    stored_depth = C.Lookup(new_state[2])
+                    if stored_depth is None or depth + 1 < stored_depth:
+                        C.Store(new_state[2], depth + 1)
+                        path.append(new_state)
+                        successors.append(None)
+                        self.iteration_count += 1
+                        break
+                else:
+                    path.pop()
+                    successors.pop()
+            cur_depth += 1
+
+        self.table_overwrites = C.overwrites
+        return None
+
+    def Packed_Successors(self, level, state):
+        return [PackedState(cell, boxes, key, state)
+                for cell, boxes, key in self.Compact_Successors(level, state.player, state.boxes, state.hash)]
+
+    def Compact_Successors(self, level, player, boxes, key):
+        successors = list()
+        player_keys = level.player_keys
+        box_keys = level.box_keys
+        player_key = player_keys[player]
+        for neighbors in level.neighbors:
+            cell = neighbors[player]
+            if cell < 0:
+                continue
+            bit = 1 << cell
+            if boxes & bit:
+                next_cell = neighbors[cell]
+                if next_cell < 0:
+                    continue
+                next_bit = 1 << next_cell
+                if boxes & next_bit:
+                    continue
+                new_boxes = boxes ^ bit | next_bit
+                if self.Is_Pruned_Push(level.cells[next_cell], level.View(new_boxes)):
+                    continue
+                successors.append((cell, new_boxes, key ^ player_key ^ player_keys[cell] ^ box_keys[cell] ^ box_keys[next_cell]))
+            else:
+                successors.append((cell, boxes, key ^ player_key ^ player_keys[cell]))
+        self.generated_count += len(successors)
+        return successors
+
+    def Move_Successors(self, state):
+        successors = list()
+        for direction in self.delta:
+            new_state = self.Check_Direction(direction, state)
+            if new_state != None:
+                new_state.depth = state.depth + 1
+                successors.append(new_state)
+        return successors
+
+    def Heuristic(self, boxes):
+        match self.heuristic:
+            case 'manhattan':
+                return self.Manhattan_Heuristic(boxes)
+            case 'matching':
+                return self.Matching_Heuristic(boxes)
+
+    def Manhattan_Heuristic(self, boxes):
+        if not self.targets:
+            return math.inf
+        total = 0
+        for bx, by in boxes:
+            total += min(abs(bx - tx) + abs(by - ty) for tx, ty in self.targets)
+        return total
+
+    def Matching_Heuristic(self, boxes):
+        cost = [
+            [self.push_distances[target].get(box, math.inf) for target in self.targets]
+            for box in boxes
+        ]
+        return Min_Cost_Matching(cost)
+
+    def Is_Floor(self, cell):
+        x, y = cell
+        if not (0 <= x < self.map_cols and 0 <= y < self.map_rows):
+            return False
+        return self.map[y][x] not in ('#', ' ')
+
+    def Is_Free(self, cell, boxes):
+        return self.Is_Floor(cell) and cell not in boxes
+
+    def Is_Target(self, cell):
+        x, y = cell
+        return self.map[y][x] == 'X'
+
+    def Is_Pruned_Push(self, box, boxes):
+        if not self.pruning:
+            return False
+        if box in self.dead_squares:
+            self.dead_square_pruned += 1
+            return True
+        if self.Is_Freeze_Deadlock(box, boxes):
+            self.freeze_pruned += 1
+            return True
+        return False
+
+    def Is_Freeze_Deadlock(self, box, boxes):
+        frozen = set()
+        if not self.Is_Frozen(box, boxes, set(), frozen):
+            return False
+        return any(not self.Is_Target(frozen_box) for frozen_box in frozen)
+
+    def Is_Frozen(self, box, boxes, checked, frozen):
+        checked.add(box)
+        is_frozen = self.Is_Blocked(box, boxes, checked, frozen, (1, 0)) and self.Is_Blocked(box, boxes, checked, frozen, (0, 1))
+        checked.remove(box)
+        if is_frozen:
+            frozen.add(box)
+        return is_frozen
+
+    def Is_Blocked(self, box, boxes, checked, frozen, axis):
+        dx, dy = axis
+        x, y = box
+        sides = [(x - dx, y - dy), (x + dx, y + dy)]
+        if not self.Is_Floor(sides[0]) or not self.Is_Floor(sides[1]):
+            return True
+        if sides[0] in self.dead_squares and sides[1] in self.dead_squares:
+            return True
+        for side in sides:
+            if side in checked:
+                return True
+            if side in boxes and self.Is_Frozen(side, boxes, checked, frozen):
+                return True
+        return False
+
+    def Reachable(self, player, boxes):
+        floor = self.level.index
+        reachable = {player}
+        frontier = [player]
+        while frontier:
+            x, y = frontier.pop()
+            for dx, dy in self.delta.values():
+                next_cell = (x + dx, y + dy)
+                if next_cell not in reachable and next_cell in floor and next_cell not in boxes:
+                    reachable.add(next_cell)
+                    frontier.append(next_cell)
+        return reachable
+
+    def Normalize_Player(self, player, boxes):
+        return min(self.Reachable(player, boxes))
+
+    def Walk(self, source, target, boxes):
+        parents = {source: None}
+        frontier = Make_Frontier('queue')
+        frontier.Put(source)
+        while frontier:
+            cell = frontier.Get()
+            if cell == target:
+                break
+            x, y = cell
+            for dx, dy in self.delta.values():
+                next_cell = (x + dx, y + dy)
+                if next_cell not in parents and self.Is_Free(next_cell, boxes):
+                    parents[next_cell] = cell
+                    frontier.Put(next_cell)
+
+        walk = list()
+        cell = target
+        while cell != source:
+            walk.append(cell)
+            cell = parents[cell]
+        walk.reverse()
+        return walk
+
+    def Build_Push_Path(self, start_player, state, final_player):
+        push_states = list()
+        while state is not None:
+            push_states.append(state)
+            state = state.prev_state
+        push_states.reverse()
+
+        player = start_player
+        path = [State(player, push_states[0].boxes)]
+        for prev, cur in zip(push_states, push_states[1:]):
+            box, = prev.boxes - cur.boxes
+            target, = cur.boxes - prev.boxes
+            others = prev.boxes - {box}
+            dx, dy = target[0] - box[0], target[1] - box[1]
+            if abs(dx) + abs(dy) == 1 and (box[0] - dx, box[1] - dy) in self.Reachable(player, prev.boxes):
+                pushes = [box, target]
+            else:
+                pushes = self.Box_Path(box, target, others, player)
+            for (bx, by), (nbx, nby) in zip(pushes, pushes[1:]):
+                dx, dy = nbx - bx, nby - by
+                boxes = others | {(bx, by)}
+                for cell in self.Walk(player, (bx - dx, by - dy), boxes):
+                    path.append(State(cell, boxes))
+                player = (bx, by)
+                path.append(State(player, others | {(nbx, nby)}))
+        if final_player is not None:
+            for cell in self.Walk(player, final_player, push_states[-1].boxes):
+                path.append(State(cell, push_states[-1].boxes))
+
+        self.steps_counter += len(path) - 1
+        return path
+
+    def Build_Path(self, state):
+        path = list()
+        while state.prev_state != None:
+            self.steps_counter += 1
+            path.append(state)
+            state = state.prev_state
+        path.append(state)
+        path.reverse()
+        return path
+
+    def Connect_Ways(self, state_start_end, state_final_end):
+        path = list()
+        state = state_final_end
+        while state is not None:
+            path.append(state)
+            state = state.prev_state
+        path.reverse()
+
+        state = state_start_end.prev_state
+        while state is not None:
+            path.append(state)
+            state = state.prev_state
+        path.reverse()
+
+        self.steps_counter += len(path) - 1
+        return path
+
+    def Path_To_Moves(self, path):
+        moves = list()
+        for prev, cur in zip(path, path[1:]):
+            (x, y), (nx, ny) = prev.player, cur.player
+            letter = self.move_letters[(nx - x, ny - y)]
+            if prev.boxes != cur.boxes:
+                letter = letter.upper()
+            moves.append(letter)
+        return ''.join(moves)
+
+    def Check_Direction(self, direction, state):
+        delta = {
+            'up':    (0, -1),
+            'down':  (0,  1),
+            'left':  (-1, 0),
+            'right': (1,  0)
+        }
+        dx, dy = delta[direction]
+        x, y = state.player
+        nx, ny = x + dx, y + dy
+
+        if not (0 <= nx < self.map_cols and 0 <= ny < self.map_rows):
+            return None
+
+        if self.map[ny][nx] == '#':
+            return None
+
+        boxes = set(state.boxes)
+        if (nx, ny) in boxes:
+            nnx, nny = nx + dx, ny + dy
+            if not (0 <= nnx < self.map_cols and 0 <= nny < self.map_rows):
+                return None
+            if self.map[nny][nnx] == '#' or (nnx, nny) in boxes:
+                return None
+            boxes.remove((nx, ny))
+            boxes.add((nnx, nny))
+            if self.Is_Pruned_Push((nnx, nny), boxes):
+                return None
+
+        self.generated_count += 1
+        return State((nx, ny), boxes, state, state.depth + 1)
+
+    def Check_Direction_Backwards(self, direction, state):
+        dx, dy = {
+            'up':    (0, -1),
+            'down':  (0,  1),
+            'left':  (-1, 0),
+            'right': (1,  0)
+        }[direction]
+
+        x, y = state.player
+        bx, by = x + dx, y + dy
+        px, py = x - dx, y - dy
+        states = list()
+
+        if not (0 <= bx < self.map_cols and 0 <= by < self.map_rows):
+            return states
+        if not (0 <= px < self.map_cols and 0 <= py < self.map_rows):
+            return states
+
+        if self.map[py][px] == '#':
+            return states
+
+        boxes = set(state.boxes)
+
+        if (px, py) in boxes:
+            return states
+
+        if (bx, by) in boxes:
+            states.append(State((px, py), boxes, state))
+            boxes.remove((bx, by))
+            boxes.add((x, y))
+            states.append(State((px, py), boxes, state))
+            self.generated_count += 2
+            return states
+
+        self.generated_count += 1
+        states.append(State((px, py), boxes, state))
+        return states
@@ -0,0 +1,72 @@
+from array import array
+
+class TranspositionTable:
+    policies = ['always', 'shallower']
+
+    def __init__(self, capacity = 1 << 20, policy = 'always', probes = 4):
+        if policy not in self.policies:
+            raise ValueError(f'Unknown replacement policy: {policy}')
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self.mask = size - 1
+        self.policy = policy
+        self.probes = probes
+        self.keys = array('Q', bytes(8 * size))
+        self.values = array('i', bytes(4 * size))
+        self.generations = array('I', bytes(4 * size))
+        self.generation = 1
+        self.count = 0
+        self.overwrites = 0
+
+    def New_Generation(self):
+        self.generation += 1
+
+    def Lookup(self, key):
+        key = key or 1
+        index = key & self.mask
+        for _ in range(self.probes):
+            stored_key = self.keys[index]
+            if stored_key == 0:
+                return None
+            if stored_key == key and self.generations[index] == self.generation:
+                return self.values[index]
+            index = (index + 1) & self.mask
+        return None
+
+    def Store(self, key, value):
+        key = key or 1
+        index = key & self.mask
+        free = None
+        victim = None
+        for _ in range(self.probes):
+            stored_key = self.keys[index]
+            if stored_key == 0:
+                if free is None:
+                    free = index
+                    self.count += 1
+                break
+            if self.generations[index] != self.generation:
+                if free is None:
+                    free = index
+            elif stored_key == key:
+                self.values[index] = value
+                return
+            elif victim is None or self.values[index] > self.values[victim]:
+                victim = index
+            index = (index + 1) & self.mask
+
+        if free is None:
+            match self.policy:
+                case 'always':
+                    free = key & self.mask
+                case 'shallower':
+                    if value > self.values[victim]:
+                        return
+                    free = victim
+            self.overwrites += 1
+
+        self.keys[free] = key
+        self.values[free] = value
+        self.generations[free] = self.generation
@@ -0,0 +1,109 @@
+import solver
+from packed import PackedState
+
+def Key_View(players, boxes):
+    import numpy as np
+    rows = np.ascontiguousarray(np.column_stack([players.astype(np.uint64), boxes]))
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+def Bit_Test(boxes, cells):
+    import numpy as np
+    words = boxes[np.arange(len(cells)), cells >> 6]
+    return (words >> (cells & 63).astype(np.uint64)) & np.uint64(1) == 1
+
+def Pack_Boxes(boxes, words):
+    import numpy as np
+    packed = np.zeros(words, dtype=np.uint64)
+    for word in range(words):
+        packed[word] = (boxes >> (64 * word)) & ((1 << 64) - 1)
+    return packed
+
+def Unpack_Boxes(words):
+    return sum(int(word) << (64 * index) for index, word in enumerate(words))
+
+def Vector_Search(owner, level_name):
+    import numpy as np
+    start_state, final_state = owner.Load_Level(level_name)
+    level = owner.Pack_Level()
+    start_state = level.Pack(start_state)
+    final_state = level.Pack(final_state)
+
+    words = (len(level.cells) + 63) // 64
+    neighbors = [np.array(direction, dtype=np.int64) for direction in level.neighbors]
+    dead = np.array([cell in owner.dead_squares for cell in level.cells], dtype=bool)
+    goal_boxes = Pack_Boxes(final_state.boxes, words)
+    check_player = owner.goal == 'state'
+    one = np.uint64(1)
+
+    players = np.array([start_state.player], dtype=np.int64)
+    boxes = Pack_Boxes(start_state.boxes, words).reshape(1, words)
+    visited = np.sort(Key_View(players, boxes))
+    layers = [(players, boxes, np.array([-1], dtype=np.int64))]
+
+    while len(players):
+        owner.search_depth = len(layers) - 1
+        owner.iteration_count += len(players)
+        owner.Count_Nodes(len(visited), len(players))
+        owner.Check_Budget(len(visited), len(players))
+
+        goal = np.all(boxes == goal_boxes, axis=1)
+        if check_player:
+            goal &= players == final_state.player
+        if goal.any():
+            index = int(np.argmax(goal))
+            owner.O_end_node_count = len(players) - index - 1
+            path = list()
+            for layer_players, layer_boxes, parents in reversed(layers):
+                path.append(solver.State(*level.Unpack(PackedState(
+                    int(layer_players[index]), Unpack_Boxes(layer_boxes[index]), 0))))
+                index = int(parents[index])
+            path.reverse()
+            owner.steps_counter += len(path) - 1
+            return path
+
+        rows = np.arange(len(players))
+        new_players = list()
+        new_boxes = list()
+        new_parents = list()
+        for direction in neighbors:
+            cells = direction[players]
+            valid = cells >= 0
+            safe_cells = np.where(valid, cells, 0)
+            pushing = valid & Bit_Test(boxes, safe_cells)
+
+            walk = valid & ~pushing
+            new_players.append(cells[walk])
+            new_boxes.append(boxes[walk])
+            new_parents.append(rows[walk])
+
+            next_cells = np.where(pushing, direction[safe_cells], -1)
+            pushing &= next_cells >= 0
+            safe_next = np.where(pushing, next_cells, 0)
+            pushing &= ~Bit_Test(boxes, safe_next)
+            if owner.pruning:
+                owner.dead_square_pruned += int(np.count_nonzero(pushing & dead[safe_next]))
+                pushing &= ~dead[safe_next]
+            pushed = boxes[pushing].copy()
+            push_rows = np.arange(len(pushed))
+            from_cells = safe_cells[pushing]
+            to_cells = safe_next[pushing]
+            pushed[push_rows, from_cells >> 6] &= ~(one << (from_cells & 63).astype(np.uint64))
+            pushed[push_rows, to_cells >> 6] |= one << (to_cells & 63).astype(np.uint64)
+            new_players.append(from_cells)
+            new_boxes.append(pushed)
+            new_parents.append(rows[pushing])
+
+        players = np.concatenate(new_players)
+        boxes = np.concatenate(new_boxes)
+        parents = np.concatenate(new_parents)
+        owner.generated_count += len(players)
+
+        keys, first = np.unique(Key_View(players, boxes), return_index=True)
+        positions = np.searchsorted(visited, keys)
+        fresh = visited[np.minimum(positions, len(visited) - 1)] != keys
+        visited = np.insert(visited, positions[fresh], keys[fresh])
+        first = np.sort(first[fresh])
+        players, boxes, parents = players[first], boxes[first], parents[first]
+        layers.append((players, boxes, parents))
+
+    return None